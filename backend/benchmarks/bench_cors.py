@@ -0,0 +1,144 @@
+"""
+Per-request cost of the CORS layer.
+
+Compares the old stack (Starlette's CORSMiddleware under an
+@app.middleware("http") function that rewrote the headers) with
+CORSHeadersMiddleware, on a tiny JSON route, a streamed route and an
+OPTIONS preflight. The ASGI apps are called directly, so the numbers are
+middleware overhead only, without a server or network.
+
+Needs the app environment (DATABASE_URL etc.) because it imports main.py.
+Run from backend/:
+
+    python -m benchmarks.bench_cors [requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+
+from fastapi_app import main
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+
+def add_routes(app: FastAPI) -> FastAPI:
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(8):
+                yield b"x" * 512
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def old_app() -> FastAPI:
+    app = add_routes(FastAPI())
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=main.ALLOWED_ORIGINS,
+        allow_origin_regex=".*",
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.middleware("http")
+    async def add_cors_headers(request: Request, call_next):
+        origin = request.headers.get("origin")
+        if request.method == "OPTIONS":
+            response = Response(status_code=200)
+        else:
+            response = await call_next(request)
+        if origin:
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+            main.add_vary(response.headers, "Origin")
+        else:
+            response.headers["Access-Control-Allow-Origin"] = "*"
+        response.headers["Access-Control-Allow-Methods"] = main.CORS_ALLOW_METHODS
+        response.headers["Access-Control-Allow-Headers"] = main.CORS_ALLOW_HEADERS
+        return response
+
+    return app
+
+
+def new_app() -> FastAPI:
+    app = add_routes(FastAPI())
+    app.add_middleware(main.CORSHeadersMiddleware)
+    return app
+
+
+def make_scope(method: str, path: str) -> dict:
+    headers = [(b"host", b"api.example.com"), (b"origin", b"https://gtnnetwork.com")]
+    if method == "OPTIONS":
+        headers.append((b"access-control-request-method", b"POST"))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("api.example.com", 80),
+    }
+
+
+async def call(app, method: str, path: str) -> list:
+    messages = []
+    received = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(make_scope(method, path), receive, send)
+    finished.set()
+    return messages
+
+
+async def bench(label: str, app, method: str, path: str) -> float:
+    for _ in range(200):
+        await call(app, method, path)
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app, method, path)
+    per_request = (time.perf_counter() - started) / REQUESTS * 1e6
+    print(f"{label:<28} {per_request:8.1f} us/request")
+    return per_request
+
+
+async def run() -> None:
+    old, new = old_app(), new_app()
+    print(f"{REQUESTS} requests per case")
+    for method, path in [("GET", "/ping"), ("GET", "/stream"), ("OPTIONS", "/ping")]:
+        before = await bench(f"old {method} {path}", old, method, path)
+        after = await bench(f"new {method} {path}", new, method, path)
+        print(f"{'saved':<28} {before - after:8.1f} us/request\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,112 @@
+"""
+Per-row cost of turning Event rows into a JSON response body.
+
+Compares the old path (build EventOut models, then let FastAPI dump them,
+re-validate against response_model and encode with the stdlib json) with
+the current one (rows -> plain dicts -> orjson, as used by cached_json).
+
+Needs the app environment (DATABASE_URL etc.) because it imports main.py;
+no rows are written. Run from backend/:
+
+    python -m benchmarks.bench_serialization [rows]
+"""
+
+import json
+import sys
+import time
+from datetime import date, datetime, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+
+from fastapi_app import main
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+IMAGES_PER_ROW = 8
+
+
+def make_rows(count: int) -> List[main.Event]:
+    now = datetime.now(timezone.utc)
+    return [
+        main.Event(
+            id=i,
+            name=f"Event {i}",
+            event_date=date(2025, 1, 1),
+            location="Dubai",
+            link="https://example.com/event",
+            description="d" * 200,
+            body="<p>" + "b" * 2000 + "</p>",
+            image_url=f"https://example.com/uploads/{i}-cover.png",
+            image_urls=[
+                f"https://example.com/uploads/{i}-{j}.png" for j in range(IMAGES_PER_ROW)
+            ],
+            created_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def serialize_event_model(event: main.Event) -> main.EventOut:
+    """The previous serializer: one validated EventOut per row."""
+    row = main.serialize_event(event)
+    row["image_variants"] = {
+        url: [main.ImageVariant(**variant) for variant in variants]
+        for url, variants in row["image_variants"].items()
+    }
+    return main.EventOut(**row)
+
+
+response_field = TypeAdapter(List[main.EventOut])
+
+
+def old_path(rows: List[main.Event]) -> bytes:
+    # What FastAPI did with response_model=List[EventOut]: dump the models,
+    # validate them again, dump to JSON-safe data and encode with json.
+    models = [serialize_event_model(row) for row in rows]
+    content = [model.model_dump() for model in models]
+    validated = response_field.validate_python(content)
+    return json.dumps(
+        response_field.dump_python(validated, mode="json"),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def validate_once_path(rows: List[main.Event]) -> bytes:
+    return response_field.dump_json([serialize_event_model(row) for row in rows])
+
+
+def new_path(rows: List[main.Event]) -> bytes:
+    return main.encode_json([main.serialize_event(row) for row in rows])
+
+
+def bench(label: str, func, rows: List[main.Event], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - started)
+    per_row = best / len(rows) * 1e6
+    print(f"{label:<36} {per_row:8.2f} us/row")
+    return per_row
+
+
+if __name__ == "__main__":
+    rows = make_rows(ROWS)
+    # Pretend every image already has derivatives so image_variants does real work.
+    for row in rows:
+        for url in main.merged_images(row.image_url, row.image_urls):
+            name = main.upload_name_from_url(url)
+            main.derivative_store._known[name] = {
+                "variants": [
+                    {"file": f"{name}-{width}w.webp", "width": width, "format": "webp"}
+                    for width in main.IMAGE_DERIVATIVE_WIDTHS
+                ]
+            }
+
+    assert json.loads(old_path(rows[:10])) == json.loads(new_path(rows[:10]))
+    print(f"{ROWS} events, {IMAGES_PER_ROW + 1} images each")
+    before = bench("models + response_model + json", old_path, rows)
+    bench("models validated once + dump_json", validate_once_path, rows)
+    after = bench("dicts + orjson", new_path, rows)
+    print(f"speedup: {before / after:.1f}x")
@@ -0,0 +1,187 @@
+"""
+Responsive image derivatives.
+
+Runs inside the upload process pool, so it must stay importable without
+pulling in the app (database engine, settings) from main.py.
+"""
+
+import gzip
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from PIL import ExifTags, Image, ImageOps
+except ImportError:  # pragma: no cover - derivatives are optional
+    ExifTags = None
+    Image = None
+    ImageOps = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DERIVABLE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".avif"}
+# Text-like uploads that get .gz/.br copies instead of resized variants.
+PRECOMPRESS_SUFFIXES = {".svg", ".ico"}
+# EXIF orientations that swap width and height once applied.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+SAVE_FORMATS = {"webp": "WEBP", "avif": "AVIF"}
+IMAGE_ERRORS = (OSError, ValueError) + ((Image.DecompressionBombError,) if Image else ())
+SIDECAR_SUFFIX = ".json"
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+def sidecar_path(out_dir: Path, name: str) -> Path:
+    return out_dir / f"{name}{SIDECAR_SUFFIX}"
+
+
+def read_sidecar(out_dir: Path, name: str) -> Optional[Dict[str, Any]]:
+    try:
+        with sidecar_path(out_dir, name).open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def sidecar_files(record: Dict[str, Any]) -> List[str]:
+    """Every derived file a sidecar points at."""
+    return [item["file"] for item in record.get("variants", [])] + [
+        item["file"] for item in record.get("encodings", [])
+    ]
+
+
+def supported_formats(formats: Sequence[str]) -> List[str]:
+    """The derivative formats this Pillow build can write."""
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt in formats if SAVE_FORMATS.get(fmt) in Image.SAVE]
+
+
+def _write_atomic(image: Any, dest: Path, fmt: str, quality: int) -> None:
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    image.save(tmp, format=SAVE_FORMATS[fmt], quality=quality, method=4)
+    os.replace(tmp, dest)
+
+
+def _precompress(source_path: Path, name: str, target_dir: Path) -> List[Dict[str, Any]]:
+    data = source_path.read_bytes()
+    encoders = [("gzip", ".gz", lambda raw: gzip.compress(raw, 9, mtime=0))]
+    if brotli is not None:
+        encoders.insert(0, ("br", ".br", lambda raw: brotli.compress(raw, quality=11)))
+
+    encodings = []
+    for encoding, suffix, compress in encoders:
+        packed = compress(data)
+        if len(packed) >= len(data):
+            continue
+        filename = f"{name}{suffix}"
+        dest = target_dir / filename
+        tmp = dest.with_name(f".{dest.name}.tmp")
+        tmp.write_bytes(packed)
+        os.replace(tmp, dest)
+        encodings.append({"file": filename, "encoding": encoding, "size": len(packed)})
+    return encodings
+
+
+def _resize(
+    source_path: Path,
+    name: str,
+    target_dir: Path,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    quality: int,
+) -> Dict[str, Any]:
+    variants: List[Dict[str, Any]] = []
+    with Image.open(source_path) as original:
+        # Widths are those of the image as displayed, after EXIF rotation.
+        orientation = original.getexif().get(ExifTags.Base.Orientation)
+        if orientation in TRANSPOSED_ORIENTATIONS:
+            source_width = original.height
+        else:
+            source_width = original.width
+        targets = {w for w in widths if w < source_width}
+        if original.format != "WEBP" or not targets:
+            # A full-size copy lets /uploads answer WebP-capable clients.
+            targets.add(source_width)
+        targets = sorted(targets, reverse=True)
+        # Let JPEG decode at a reduced scale when the largest target allows.
+        scale = targets[0] / source_width
+        original.draft(
+            "RGB",
+            (math.ceil(original.width * scale), math.ceil(original.height * scale)),
+        )
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        current = image
+        for width in targets:
+            height = max(1, round(current.height * width / current.width))
+            if width != current.width:
+                current = current.resize(
+                    (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+                )
+            current.info = {}
+            for fmt in supported_formats(formats):
+                # Keep the full name so photo.jpg and photo.png don't collide.
+                filename = f"{name}-{width}w.{fmt}"
+                _write_atomic(current, target_dir / filename, fmt, quality)
+                variants.append({"file": filename, "width": width, "format": fmt})
+    return {"width": source_width, "variants": variants}
+
+
+def generate_derivatives(
+    source: str,
+    name: str,
+    out_dir: str,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    quality: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Write derived copies of `source` (the upload called `name`, possibly
+    downloaded to a temp file) into `out_dir` and return its sidecar record.
+
+    Raster images get resized, metadata-free variants at each width below
+    the original plus one at full size. Text-like formats get .br/.gz copies
+    when those are smaller. The JSON sidecar is written last, so its
+    presence means the set is complete and later calls return it without
+    touching the image. Returns None when Pillow is needed but missing.
+    """
+    source_path = Path(source)
+    target_dir = Path(out_dir)
+    existing = read_sidecar(target_dir, name)
+    if existing is not None:
+        return existing
+
+    suffix = Path(name).suffix.lower()
+    if suffix in DERIVABLE_SUFFIXES and Image is None:
+        return None
+
+    # Derived files sit next to the sidecar, under the upload's own subdirectory.
+    sidecar_path(target_dir, name).parent.mkdir(parents=True, exist_ok=True)
+    record: Dict[str, Any] = {"source": name, "variants": [], "encodings": []}
+    try:
+        if suffix in PRECOMPRESS_SUFFIXES:
+            record["encodings"] = _precompress(source_path, name, target_dir)
+        if suffix in DERIVABLE_SUFFIXES:
+            record.update(
+                _resize(source_path, name, target_dir, widths, formats, quality)
+            )
+    except IMAGE_ERRORS:
+        # Unreadable or hostile images get an empty set so they aren't retried.
+        record = {"source": name, "variants": [], "encodings": []}
+
+    sidecar = sidecar_path(target_dir, name)
+    tmp = sidecar.with_name(f".{sidecar.name}.tmp")
+    tmp.write_text(json.dumps(record), encoding="utf-8")
+    os.replace(tmp, sidecar)
+    return record
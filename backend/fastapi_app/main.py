@@ -3,15 +3,55 @@ import time
 import hmac
 import hashlib
 import secrets
+import sys
 import json
+import logging
+import mimetypes
+import base64
+import inspect
+import io
+import gzip
+import zlib
+import re
+import html
+import itertools
+import multiprocessing
+import shutil
+import tempfile
 import zipfile
-from io import BytesIO
 from pathlib import Path
-from typing import Optional, List, Generator, Any, Dict
-from datetime import date, datetime
+from urllib.parse import unquote
+from typing import (
+    Optional,
+    List,
+    AsyncGenerator,
+    IO,
+    Iterator,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Literal,
+    NamedTuple,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from datetime import date, datetime, timedelta
 import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
 import httpx
+import orjson
+from psycopg import sql as pg_sql
+from python_multipart.multipart import MultipartParser, parse_options_header
 
 from fastapi import (
     FastAPI,
@@ -22,14 +62,64 @@ from fastapi import (
     Form,
     Response,
     Request,
+    Query,
 )
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import create_engine, func, text
-from sqlalchemy.orm import sessionmaker, DeclarativeBase, Mapped, mapped_column, Session
-from sqlalchemy import String, Text, Date, DateTime
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import create_engine, func, text, and_, or_, select, delete
+from sqlalchemy import Computed, Index, all_, bindparam, case, literal_column, tuple_
+from sqlalchemy import union_all
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import ProgrammingError, TimeoutError as SATimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    load_only,
+)
+from sqlalchemy import String, Text, Date, DateTime, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, TSVECTOR
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from pydantic import BaseModel, ConfigDict, Field
 
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+except ImportError:  # only needed for UPLOAD_STORAGE=s3
+    boto3 = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:  # HTTP/2 for the shared outbound client (httpx[http2])
+    import h2  # noqa: F401
+except ImportError:
+    h2 = None
+
+try:
+    from fastapi_app import images as image_derivatives
+except ImportError:  # running from inside the fastapi_app directory
+    import images as image_derivatives
+
+logger = logging.getLogger(__name__)
+
 # --------------------
 # Environment
 # --------------------
@@ -42,6 +132,16 @@ if DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
 
 PG_SSLMODE = os.getenv("PGSSLMODE", "require")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Managed Postgres drops idle sockets; recycle well before that and ping on
+# checkout so a dead connection is replaced instead of failing the request.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Apply pending schema migrations at startup instead of refusing to start.
+# Meant for local development; deployments run `python -m fastapi_app.main migrate`.
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "false").lower() == "true"
 
 ADMIN_USER = os.getenv("ADMIN_USER", "admin")
 ADMIN_PASS = os.getenv("ADMIN_PASS", "admin@123")
@@ -70,22 +170,218 @@ DEFAULT_UPLOAD_DIR = BASE_DIR / "uploads"
 UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", str(DEFAULT_UPLOAD_DIR)))
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 UPLOAD_BASE_URL = os.getenv("UPLOAD_BASE_URL")
+UPLOAD_TMP_DIR = Path(os.getenv("UPLOAD_TMP_DIR", tempfile.gettempdir()))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+# Multipart boundaries and part headers on top of the file itself.
+UPLOAD_FORM_OVERHEAD = 16 * 1024
+# Unreferenced uploads younger than this are kept: the form that will use
+# them may not have been saved yet.
+UPLOAD_GC_GRACE = timedelta(hours=int(os.getenv("UPLOAD_GC_GRACE_HOURS", "24")))
+DERIVED_DIR = Path(os.getenv("DERIVED_DIR", str(BASE_DIR / "uploads-derived")))
+DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+IMAGE_DERIVATIVE_WIDTHS = tuple(
+    int(w)
+    for w in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "320,640,1280").split(",")
+    if w.strip()
+)
+IMAGE_DERIVATIVE_FORMATS = tuple(
+    f.strip().lower()
+    for f in os.getenv("IMAGE_DERIVATIVE_FORMATS", "webp").split(",")
+    if f.strip()
+)
+IMAGE_DERIVATIVE_QUALITY = int(os.getenv("IMAGE_DERIVATIVE_QUALITY", "75"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+UPLOAD_STORAGE = os.getenv("UPLOAD_STORAGE", "local").lower()
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY")
+S3_PUBLIC_BASE_URL = os.getenv("S3_PUBLIC_BASE_URL")
+S3_PRESIGN_EXPIRES = int(os.getenv("S3_PRESIGN_EXPIRES", "3600"))
+S3_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+# Upload and derivative names are content-addressed, so they never change.
+UPLOAD_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# An original whose derivatives are still being resolved may soon be served
+# as a variant instead, so it is only cached briefly.
+UPLOAD_PENDING_CACHE_CONTROL = "public, max-age=60"
+# Variants are negotiated on these headers for any derivable upload, whether
+# or not its derivatives exist yet.
+UPLOAD_VARY = "Accept, Accept-Encoding"
 MAX_EVENT_IMAGES = 60
 MAX_NEWS_IMAGES = 30
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+CONTENT_TABLES = ("projects", "events", "news", "blogs")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "6"))
+# How long browsers may reuse a preflight answer (Chromium caps it at 7200).
+CORS_MAX_AGE = int(os.getenv("CORS_MAX_AGE", "86400"))
+# Off by default: every Origin is echoed. When on, only ALLOWED_ORIGINS are.
+CORS_RESTRICT_ORIGINS = os.getenv("CORS_RESTRICT_ORIGINS", "false").lower() == "true"
 
 # --------------------
 # Database setup
 # --------------------
-engine = create_engine(
+class PoolMetrics:
+    """Counters fed by SQLAlchemy pool events plus wait and connect timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connect_count = 0
+        self.connect_total = 0.0
+        self.connect_max = 0.0
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_connect(self, seconds: float) -> None:
+        with self._lock:
+            self.connect_count += 1
+            self.connect_total += seconds
+            self.connect_max = max(self.connect_max, seconds)
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            avg_wait = self.wait_total / self.wait_count if self.wait_count else 0.0
+            avg_connect = (
+                self.connect_total / self.connect_count if self.connect_count else 0.0
+            )
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": DB_MAX_OVERFLOW,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(avg_wait * 1000, 3),
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+                "connect_ms_avg": round(avg_connect * 1000, 3),
+                "connect_ms_max": round(self.connect_max * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueue(AsyncAdaptedQueue):
+    """Pool queue that records how long each checkout waited for a connection."""
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records checkout waits (TimedQueue), the time spent
+    opening new connections, and checkouts that timed out.
+    """
+
+    _queue_class = TimedQueue
+
+    def _do_get(self):
+        try:
+            return super()._do_get()
+        except SATimeoutError:
+            pool_metrics.incr("timeouts")
+            raise
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            pool_metrics.record_connect(time.perf_counter() - start)
+
+
+# Request handlers go through the async engine so they never hold a
+# threadpool thread while waiting on Postgres.
+async_engine = create_async_engine(
     DATABASE_URL,
     connect_args={"sslmode": PG_SSLMODE},
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
 )
 
+for pool_event, counter in (
+    ("connect", "connects"),
+    ("checkout", "checkouts"),
+    ("checkin", "checkins"),
+    ("invalidate", "invalidations"),
+):
+    sa_event.listen(
+        async_engine.sync_engine,
+        pool_event,
+        lambda *args, _counter=counter: pool_metrics.incr(_counter),
+    )
+
 
 class Base(DeclarativeBase):
     pass
 
 
+# Text search configuration baked into the generated search_vector columns;
+# changing it needs a migration that recreates them.
+SEARCH_CONFIG = "english"
+
+
+def search_vector_sql(*weighted: Tuple[str, Tuple[str, ...]]) -> str:
+    """
+    The generated-column expression for a search_vector: each (weight,
+    columns) group is indexed with that weight (A ranks highest).
+    """
+    parts = []
+    for weight, columns in weighted:
+        document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+        parts.append(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', {document}), '{weight}')"
+        )
+    return " || ".join(parts)
+
+
+EVENT_SEARCH_VECTOR = search_vector_sql(
+    ("A", ("name",)), ("B", ("location", "description")), ("C", ("body",))
+)
+NEWS_SEARCH_VECTOR = search_vector_sql(
+    ("A", ("title",)), ("B", ("description",)), ("C", ("body",))
+)
+BLOG_SEARCH_VECTOR = search_vector_sql(
+    ("A", ("title",)), ("B", ("excerpt",)), ("C", ("body",))
+)
+
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -96,10 +392,16 @@ class Project(Base):
     created_at: Mapped[Optional[DateTime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
 
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(Text, nullable=False)
@@ -109,28 +411,52 @@ class Event(Base):
     description: Mapped[Optional[str]] = mapped_column(Text)
     body: Mapped[Optional[str]] = mapped_column(Text)
     image_url: Mapped[Optional[str]] = mapped_column(Text)
-    image_urls: Mapped[Optional[str]] = mapped_column(Text)
+    image_urls: Mapped[List[str]] = mapped_column(
+        ARRAY(Text), nullable=False, server_default=text("'{}'")
+    )
     created_at: Mapped[Optional[DateTime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    # Generated by Postgres; deferred so listings never fetch it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(EVENT_SEARCH_VECTOR, persisted=True), deferred=True
+    )
 
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     body: Mapped[Optional[str]] = mapped_column(Text)
     image_url: Mapped[Optional[str]] = mapped_column(Text)
-    image_urls: Mapped[Optional[str]] = mapped_column(Text)
+    image_urls: Mapped[List[str]] = mapped_column(
+        ARRAY(Text), nullable=False, server_default=text("'{}'")
+    )
     created_at: Mapped[Optional[DateTime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    # Generated by Postgres; deferred so listings never fetch it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(NEWS_SEARCH_VECTOR, persisted=True), deferred=True
+    )
 
 
 class Blog(Base):
     __tablename__ = "blogs"
+    __table_args__ = (
+        Index("ix_blogs_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(Text, nullable=False)
@@ -141,6 +467,63 @@ class Blog(Base):
     created_at: Mapped[Optional[DateTime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    updated_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    # Generated by Postgres; deferred so listings never fetch it.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(BLOG_SEARCH_VECTOR, persisted=True), deferred=True
+    )
+
+
+class BackupManifest(Base):
+    """Upload manifest and snapshot time of each exported backup, kept so a
+    later backup can be taken incrementally against it."""
+
+    __tablename__ = "backup_manifests"
+
+    backup_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    base_id: Mapped[Optional[str]] = mapped_column(Text)
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    uploads: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class UploadObject(Base):
+    """Content index of /uploads: one row per stored file, keyed by name."""
+
+    __tablename__ = "upload_objects"
+
+    name: Mapped[str] = mapped_column(Text, primary_key=True)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    original_name: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[DateTime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class ContentVersion(Base):
+    """Per-table change counter used to derive ETags for public GET routes."""
+
+    __tablename__ = "content_versions"
+
+    table_name: Mapped[str] = mapped_column(Text, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class SchemaMigration(Base):
+    """One row per applied schema migration (see MIGRATIONS)."""
+
+    __tablename__ = "schema_migrations"
+
+    version: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
 
 class JoinRequest(Base):
@@ -157,130 +540,220 @@ class JoinRequest(Base):
     )
 
 
-Base.metadata.create_all(bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+def sync_sequences(conn: Connection) -> None:
+    """Ensure Postgres sequences are ahead of current max ids.
 
-def ensure_join_columns() -> None:
-    """Ensure legacy join_requests table has expected columns."""
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                "ALTER TABLE IF EXISTS join_requests "
-                "ADD COLUMN IF NOT EXISTS phone TEXT"
-            )
-        )
-        conn.execute(
-            text(
-                "ALTER TABLE IF EXISTS join_requests "
-                "ADD COLUMN IF NOT EXISTS country TEXT"
-            )
-        )
+    Takes a sync connection so it can run both from migrations and from async
+    code via ``AsyncConnection.run_sync``.
+    """
+    tables = ("projects", "events", "news", "blogs", "join_requests")
+    for table in tables:
         conn.execute(
             text(
-                "ALTER TABLE IF EXISTS join_requests "
-                "ADD COLUMN IF NOT EXISTS company TEXT"
+                f"""
+                SELECT setval(
+                    pg_get_serial_sequence('{table}', 'id'),
+                    GREATEST((SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), 1),
+                    false
+                );
+                """
             )
         )
-        conn.execute(
-            text(
-                "ALTER TABLE IF EXISTS join_requests "
-                "ADD COLUMN IF NOT EXISTS email TEXT"
+
+
+# --------------------
+# Schema migrations
+# --------------------
+# Columns added to tables that predate the models; older databases may lack them.
+LEGACY_COLUMNS = {
+    "projects": ["updated_at TIMESTAMPTZ DEFAULT now()"],
+    "join_requests": ["phone TEXT", "country TEXT", "company TEXT", "email TEXT"],
+    "events": [
+        "description TEXT",
+        "image_urls TEXT",
+        "body TEXT",
+        "updated_at TIMESTAMPTZ DEFAULT now()",
+    ],
+    "news": ["image_urls TEXT", "body TEXT", "updated_at TIMESTAMPTZ DEFAULT now()"],
+    "blogs": ["body TEXT", "updated_at TIMESTAMPTZ DEFAULT now()"],
+}
+# Any constant works as long as every migration runner uses the same one.
+MIGRATION_LOCK_KEY = 0x67746E
+
+
+def migrate_baseline(conn: Connection) -> None:
+    """
+    Bring a fresh or pre-versioning database to the first tracked schema:
+    create missing tables, add the legacy columns and resync id sequences
+    (the fixups every worker used to run on import).
+    """
+    Base.metadata.create_all(bind=conn)
+    for table, columns in LEGACY_COLUMNS.items():
+        for column in columns:
+            conn.execute(
+                text(f"ALTER TABLE IF EXISTS {table} ADD COLUMN IF NOT EXISTS {column}")
             )
-        )
+    sync_sequences(conn)
 
 
-ensure_join_columns()
+IMAGE_LIST_TABLES = ("events", "news")
 
 
-def ensure_event_columns() -> None:
-    """Ensure legacy events table has expected columns."""
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                "ALTER TABLE IF EXISTS events "
-                "ADD COLUMN IF NOT EXISTS description TEXT"
-            )
+def migrate_image_urls_to_array(conn: Connection) -> None:
+    """
+    Convert events/news image_urls from JSON text to TEXT[] in place.
+    Malformed values become empty lists and non-string or blank entries are
+    dropped, the same cleanup parse_image_list applies to form input.
+    """
+    conn.execute(
+        text(
+            """
+            CREATE FUNCTION pg_temp.image_list(value TEXT) RETURNS TEXT[]
+            LANGUAGE plpgsql IMMUTABLE AS $$
+            BEGIN
+                IF value IS NULL OR jsonb_typeof(value::jsonb) <> 'array' THEN
+                    RETURN '{}';
+                END IF;
+                RETURN ARRAY(
+                    SELECT btrim(item #>> '{}')
+                    FROM jsonb_array_elements(value::jsonb) AS item
+                    WHERE jsonb_typeof(item) = 'string' AND btrim(item #>> '{}') <> ''
+                );
+            EXCEPTION WHEN invalid_text_representation THEN
+                RETURN '{}';
+            END
+            $$
+            """
         )
-        conn.execute(
+    )
+    for table in IMAGE_LIST_TABLES:
+        data_type = conn.scalar(
             text(
-                "ALTER TABLE IF EXISTS events "
-                "ADD COLUMN IF NOT EXISTS image_urls TEXT"
-            )
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_schema = current_schema() "
+                "AND table_name = :table AND column_name = 'image_urls'"
+            ),
+            {"table": table},
         )
+        if data_type == "ARRAY":  # created by the baseline from current models
+            continue
         conn.execute(
             text(
-                "ALTER TABLE IF EXISTS events "
-                "ADD COLUMN IF NOT EXISTS body TEXT"
+                f"ALTER TABLE {table} "
+                "ALTER COLUMN image_urls TYPE TEXT[] "
+                "USING pg_temp.image_list(image_urls), "
+                "ALTER COLUMN image_urls SET DEFAULT '{}', "
+                "ALTER COLUMN image_urls SET NOT NULL"
             )
         )
+    conn.execute(text("DROP FUNCTION pg_temp.image_list(TEXT)"))
 
 
-ensure_event_columns()
+SEARCH_VECTORS = {
+    "events": EVENT_SEARCH_VECTOR,
+    "news": NEWS_SEARCH_VECTOR,
+    "blogs": BLOG_SEARCH_VECTOR,
+}
 
 
-def ensure_news_columns() -> None:
-    """Ensure legacy news table has expected columns."""
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                "ALTER TABLE IF EXISTS news "
-                "ADD COLUMN IF NOT EXISTS image_urls TEXT"
-            )
-        )
+def migrate_search_vectors(conn: Connection) -> None:
+    """Add the generated search_vector columns and their GIN indexes."""
+    for table, expression in SEARCH_VECTORS.items():
         conn.execute(
             text(
-                "ALTER TABLE IF EXISTS news "
-                "ADD COLUMN IF NOT EXISTS body TEXT"
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({expression}) STORED"
             )
         )
-
-
-ensure_news_columns()
-
-
-def ensure_blog_columns() -> None:
-    """Ensure legacy blogs table has expected columns."""
-    with engine.begin() as conn:
         conn.execute(
             text(
-                "ALTER TABLE IF EXISTS blogs "
-                "ADD COLUMN IF NOT EXISTS body TEXT"
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+                f"ON {table} USING gin (search_vector)"
             )
         )
 
 
-ensure_blog_columns()
+# (version, description, step) in order. Steps receive a connection inside the
+# migration's transaction. The baseline builds fresh databases from the
+# current models, so later steps must tolerate their change already existing.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "baseline schema and legacy column fixups", migrate_baseline),
+    (2, "events/news image_urls as TEXT[]", migrate_image_urls_to_array),
+    (3, "full-text search vectors", migrate_search_vectors),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
 
 
-def sync_sequences() -> None:
-    """Ensure Postgres sequences are ahead of current max ids."""
-    tables = ("projects", "events", "news", "blogs", "join_requests")
-    with engine.begin() as conn:
-        for table in tables:
-            conn.execute(
-                text(
-                    f"""
-                    SELECT setval(
-                        pg_get_serial_sequence('{table}', 'id'),
-                        GREATEST((SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), 1),
-                        false
-                    );
-                    """
-                )
-            )
+def run_migrations() -> List[int]:
+    """
+    Apply pending migrations in order, each in its own transaction, and
+    return the versions applied. A session advisory lock makes concurrent
+    runners wait for each other instead of racing on the same ALTERs.
+    """
+    engine = create_engine(
+        DATABASE_URL, connect_args={"sslmode": PG_SSLMODE}, poolclass=NullPool
+    )
+    lock = {"key": MIGRATION_LOCK_KEY}
+    applied: List[int] = []
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), lock)
+            conn.commit()
+            try:
+                SchemaMigration.__table__.create(conn, checkfirst=True)
+                done = set(conn.scalars(select(SchemaMigration.version)))
+                conn.commit()
+                for version, description, step in MIGRATIONS:
+                    if version in done:
+                        continue
+                    with conn.begin():
+                        step(conn)
+                        conn.execute(
+                            pg_insert(SchemaMigration).values(
+                                version=version, description=description
+                            )
+                        )
+                    applied.append(version)
+            finally:
+                conn.rollback()
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), lock)
+                conn.commit()
+    finally:
+        engine.dispose()
+    return applied
 
 
-sync_sequences()
+async def current_schema_version() -> int:
+    async with async_engine.connect() as conn:
+        try:
+            version = await conn.scalar(select(func.max(SchemaMigration.version)))
+        except ProgrammingError:  # schema_migrations does not exist yet
+            return 0
+    return version or 0
+
+
+async def check_schema_version() -> None:
+    """Refuse to serve against a database older than this build expects."""
+    version = await current_schema_version()
+    if version >= SCHEMA_VERSION:
+        return
+    if DB_AUTO_MIGRATE:
+        await run_in_threadpool(run_migrations)
+        return
+    raise RuntimeError(
+        f"Database schema is at version {version}, this build needs "
+        f"{SCHEMA_VERSION}. Run `python -m fastapi_app.main migrate` first."
+    )
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 # --------------------
@@ -295,6 +768,12 @@ class ProjectOut(BaseModel):
     created_at: Optional[datetime] = None
 
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    format: str
+
+
 class EventOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
@@ -306,6 +785,7 @@ class EventOut(BaseModel):
     body: Optional[str] = None
     image_url: Optional[str] = None
     images: List[str] = Field(default_factory=list)
+    image_variants: Dict[str, List[ImageVariant]] = Field(default_factory=dict)
     created_at: Optional[datetime] = None
 
 
@@ -317,6 +797,7 @@ class NewsOut(BaseModel):
     body: Optional[str] = None
     image_url: Optional[str] = None
     images: List[str] = Field(default_factory=list)
+    image_variants: Dict[str, List[ImageVariant]] = Field(default_factory=dict)
     created_at: Optional[datetime] = None
 
 
@@ -331,6 +812,42 @@ class BlogOut(BaseModel):
     created_at: Optional[datetime] = None
 
 
+# Listing-page shapes: everything except the article body.
+class EventSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    name: str
+    event_date: Optional[date] = None
+    location: Optional[str] = None
+    link: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    images: List[str] = Field(default_factory=list)
+    image_variants: Dict[str, List[ImageVariant]] = Field(default_factory=dict)
+    created_at: Optional[datetime] = None
+
+
+class NewsSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    title: str
+    description: str
+    image_url: Optional[str] = None
+    images: List[str] = Field(default_factory=list)
+    image_variants: Dict[str, List[ImageVariant]] = Field(default_factory=dict)
+    created_at: Optional[datetime] = None
+
+
+class BlogSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    title: str
+    excerpt: str
+    author: str
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
 class JoinRequestOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
@@ -342,6 +859,24 @@ class JoinRequestOut(BaseModel):
     created_at: Optional[datetime] = None
 
 
+class SearchHitOut(BaseModel):
+    type: Literal["events", "news", "blogs"]
+    id: int
+    title: str
+    snippet: str
+    image_url: Optional[str] = None
+    rank: float
+    created_at: Optional[datetime] = None
+
+
+ItemT = TypeVar("ItemT")
+
+
+class Page(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    next_cursor: Optional[str] = None
+
+
 # --------------------
 # Auth helpers
 # --------------------
@@ -353,7 +888,41 @@ COINGECKO_MARKET_LIMIT = int(os.getenv("COINGECKO_MARKET_LIMIT", "20"))
 COINGECKO_VOLUME_SAMPLE_LIMIT = int(os.getenv("COINGECKO_VOLUME_SAMPLE_LIMIT", "10"))
 COINGECKO_CACHE_SECONDS = int(os.getenv("COINGECKO_CACHE_SECONDS", "120"))
 COINGECKO_USER_AGENT = os.getenv("COINGECKO_USER_AGENT", "GTNNetwork/1.0 (+https://gtnnetwork.com)")
-_coingecko_cache: Dict[str, Any] = {"rows": None, "ts": 0, "as_of": None}
+# Upstream request budget: a steady rate with short bursts, shared by every
+# CoinGecko call this worker makes.
+COINGECKO_RATE_PER_SECOND = float(os.getenv("COINGECKO_RATE_PER_SECOND", "4"))
+COINGECKO_BURST = int(os.getenv("COINGECKO_BURST", "4"))
+COINGECKO_CONCURRENCY = int(os.getenv("COINGECKO_CONCURRENCY", "5"))
+# Pause after a 429 without Retry-After, and the longest the /coins/markets
+# call will wait on the limiter before giving up (per-coin chart calls run
+# inside the single-flight refresh and wait out any pause instead).
+COINGECKO_THROTTLE_PAUSE = float(os.getenv("COINGECKO_THROTTLE_PAUSE", "10"))
+COINGECKO_MAX_WAIT = float(os.getenv("COINGECKO_MAX_WAIT", "5"))
+# volumeChange24h comes from a daily series, so it is cached per coin far
+# longer than the market rows themselves.
+COINGECKO_VOLUME_CACHE_SECONDS = int(os.getenv("COINGECKO_VOLUME_CACHE_SECONDS", "3600"))
+COINGECKO_VOLUME_CACHE_MAX_ENTRIES = int(
+    os.getenv("COINGECKO_VOLUME_CACHE_MAX_ENTRIES", "256")
+)
+# Refresh in the background before the cache expires, so requests never wait.
+COINGECKO_BACKGROUND_REFRESH = (
+    os.getenv("COINGECKO_BACKGROUND_REFRESH", "false").lower() == "true"
+)
+_coingecko_cache: Dict[str, Any] = {
+    "rows": None,
+    "ts": 0,
+    "as_of": None,
+    "error": None,
+    "failed_ts": 0,
+}
+_market_refresh: Optional["asyncio.Task[None]"] = None
+
+# Shared outbound HTTP client (CoinGecko and any other upstream APIs).
+HTTP_CLIENT_HTTP2 = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+HTTP_CLIENT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "20"))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "10"))
+HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "60"))
 
 
 def _sign(value: str) -> str:
@@ -396,207 +965,1697 @@ def require_admin(request: Request):
 
 
 # --------------------
-# CoinGecko proxy helpers
+# Response cache
 # --------------------
-async def fetch_coingecko_json(path: str, client: httpx.AsyncClient) -> Any:
-    url = f"{COINGECKO_BASE_URL}{path}"
-    response = await client.get(
-        url,
-        headers={"accept": "application/json", "user-agent": COINGECKO_USER_AGENT},
-    )
-    response.raise_for_status()
-    return response.json()
+class ResponseCache:
+    """
+    Bounded LRU of encoded JSON bodies for the public GET routes.
 
+    Entries are tagged with the content table they were built from so writes
+    can drop exactly the affected routes. Keys also carry the table's ETag,
+    so a write made by another worker process is never served stale here.
+    """
 
-async def get_volume_change(coin_id: str, client: httpx.AsyncClient) -> Optional[float]:
-    chart = await fetch_coingecko_json(
-        f"/coins/{coin_id}/market_chart?vs_currency=usd&days=2&interval=daily",
-        client,
-    )
-    volumes: list = chart.get("total_volumes") or []
-    if not isinstance(volumes, list) or len(volumes) < 2:
-        return None
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[str, bytes, Optional[str]]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, *keys: Tuple) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Return (body, content encoding) for the first key present, or None.
+
+        Counts one hit or miss per call, however many keys are tried.
+        """
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], entry[2]
+            self.misses += 1
+            return None
+
+    def set(
+        self, table: str, key: Tuple, body: bytes, encoding: Optional[str] = None
+    ) -> None:
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (table, body, encoding)
+            self._size += len(body)
+            while (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            stale = [key for key, (tag, _, _) in self._entries.items() if tag == table]
+            for key in stale:
+                self._size -= len(self._entries.pop(key)[1])
+            self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
 
-    try:
-        prev = volumes[-2][1]
-        latest = volumes[-1][1]
-        if isinstance(prev, (int, float)) and isinstance(latest, (int, float)) and prev > 0:
-            return ((latest - prev) / prev) * 100
-    except Exception:
-        return None
 
-    return None
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
 
 
-async def load_market_rows() -> List[Dict[str, Any]]:
-    timeout = httpx.Timeout(10.0, read=10.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        markets = await fetch_coingecko_json(
-            f"/coins/markets?vs_currency=usd&order=volume_desc&per_page={COINGECKO_MARKET_LIMIT}&page=1&sparkline=false&price_change_percentage=24h",
-            client,
-        )
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
-        rows: List[Dict[str, Any]] = []
-        for idx, coin in enumerate(markets[:COINGECKO_MARKET_LIMIT]):
-            volume_change = None
-            if idx < COINGECKO_VOLUME_SAMPLE_LIMIT:
-                try:
-                    volume_change = await get_volume_change(coin.get("id", ""), client)
-                except httpx.HTTPStatusError as exc:
-                    # If CoinGecko is throttling, stop additional chart calls
-                    if exc.response.status_code == 429:
-                        break
-                except Exception:
-                    # ignore per-coin chart failures
-                    pass
-                await asyncio.sleep(0.1)
-
-            rows.append(
-                {
-                    "id": coin.get("id"),
-                    "name": coin.get("name"),
-                    "symbol": str(coin.get("symbol", "")).upper(),
-                    "image": coin.get("image"),
-                    "price": coin.get("current_price"),
-                    "priceChange24h": coin.get("price_change_percentage_24h"),
-                    "volume": coin.get("total_volume"),
-                    "volumeChange24h": volume_change,
-                }
-            )
 
-    return rows
+def encode_json(value: Any) -> bytes:
+    """Encode serializer output in one pass; datetimes keep Pydantic's Z form."""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_UTC_Z)
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """A JSON response that skips FastAPI's response_model re-validation."""
+    return Response(
+        content=encode_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
 
 
 # --------------------
-# App
+# Response compression
 # --------------------
-app = FastAPI(title="GTN FastAPI Backend")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
-    allow_origin_regex=".*",
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+def accepted_tokens(header: str) -> Dict[str, float]:
+    """Parse an Accept/Accept-Encoding header into {token: q}."""
+    tokens: Dict[str, float] = {}
+    for item in header.split(","):
+        token, _, params = item.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        tokens[token.strip().lower()] = q
+    return tokens
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
 )
 
-if not UPLOAD_DIR.exists():
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
+class _BrotliStream:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
 
-@app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    """
-    Ensure every response carries permissive CORS headers and that
-    OPTIONS preflight requests return quickly.
-    """
-    origin = request.headers.get("origin")
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
 
-    if request.method == "OPTIONS":
-        response = Response(status_code=200)
-    else:
-        response = await call_next(request)
+    def flush(self) -> bytes:
+        return self._compressor.finish()
 
-    if origin:
-        response.headers["Access-Control-Allow-Origin"] = origin  # echo caller
-        response.headers["Access-Control-Allow-Credentials"] = "true"
-        response.headers["Vary"] = "Origin"
-    else:
-        response.headers["Access-Control-Allow-Origin"] = "*"
 
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+def _gzip_stream() -> Any:
+    # wbits=31 writes the gzip header/trailer around the deflate stream
+    return zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
 
-    return response
 
+def _zstd_stream() -> Any:
+    return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compressobj()
 
-@app.get("/api/health")
-def health(db: Session = Depends(get_db)):
-    try:
-        db.execute("SELECT 1;")
-        return {"success": True, "status": "ok"}
-    except Exception as exc:  # pragma: no cover - simple connectivity check
-        raise HTTPException(status_code=500, detail=str(exc))
 
+# Server preference when the client weighs encodings equally.
+CONTENT_ENCODERS: Dict[str, Callable[[], Any]] = {}
+if zstandard is not None:
+    CONTENT_ENCODERS["zstd"] = _zstd_stream
+if brotli is not None:
+    CONTENT_ENCODERS["br"] = _BrotliStream
+CONTENT_ENCODERS["gzip"] = _gzip_stream
 
-@app.post("/api/login")
-async def login(request: Request, response: Response):
-    data = {}
-    if request.headers.get("content-type", "").startswith("application/json"):
-        data = await request.json()
-    else:
-        data = dict(await request.form())
 
-    username = (data.get("username") or "").strip()
-    password = data.get("password") or ""
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, if any."""
+    accepted = accepted_tokens(accept_encoding)
+    wildcard = accepted.get("*", 0)
+    best, best_q = None, 0.0
+    for encoding in CONTENT_ENCODERS:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
 
-    is_admin = (username == ADMIN_USER and password == ADMIN_PASS) or (
-        username == SUPER_ADMIN_USER and password == SUPER_ADMIN_PASS
-    )
 
-    if is_admin:
-        token = create_session_token(username)
-        response.set_cookie(
-            COOKIE_NAME,
-            token,
-            max_age=SESSION_TTL_SECONDS,
-            httponly=True,
-            secure=COOKIE_SECURE,
-            samesite=COOKIE_SAMESITE,
-        )
-        return {"success": True}
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, COMPRESSION_GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress(body)
 
-    raise HTTPException(status_code=401, detail="Invalid credentials")
 
+def add_vary(headers: MutableHeaders, value: str) -> None:
+    """Append to Vary unless the header is already listed."""
+    current = [item.strip() for item in headers.get("vary", "").split(",")]
+    current = [item for item in current if item]
+    if value.lower() not in (item.lower() for item in current):
+        headers["vary"] = ", ".join([*current, value])
 
-@app.post("/api/logout")
-def logout(response: Response):
-    response.delete_cookie(COOKIE_NAME)
-    return {"success": True}
 
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Strong ETags must differ per encoding: "news-5" -> "news-5-br"."""
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
 
-@app.get("/api/session")
+
+class CompressionMiddleware:
+    """
+    Compress compressible responses above COMPRESSION_MIN_SIZE with the best
+    encoding the client accepts (zstd, br or gzip).
+
+    Responses that already carry a Content-Encoding, such as the precompressed
+    cache hits from cached_json and negotiated upload variants, pass through
+    untouched. Streamed bodies are compressed incrementally.
+
+    Compressed responses get an encoding-specific ETag. When a client
+    revalidates with one, the identity tag is added to If-None-Match so the
+    route (e.g. StaticFiles) can still answer 304, and the 304 carries the
+    encoded tag back.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        scope, held = self._revalidation_scope(scope, encoding)
+
+        start: Optional[Message] = None
+        compressor: Any = None
+        passthrough = False
+        pending: List[bytes] = []
+        pending_size = 0
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough, pending_size
+            if message["type"] == "http.response.start":
+                start = message
+                if held and message["status"] == 304:
+                    headers = MutableHeaders(raw=start["headers"])
+                    etag = headers.get("etag")
+                    if etag and encoded_etag(etag, encoding) in held:
+                        headers["etag"] = encoded_etag(etag, encoding)
+                        add_vary(headers, "Accept-Encoding")
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                media_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or "content-range" in headers
+                    or not media_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                # Hold small chunks back until we know the body is worth it.
+                pending.append(message.get("body", b""))
+                pending_size += len(pending[-1])
+                if more_body and pending_size < self.minimum_size:
+                    return
+                body = b"".join(pending)
+                pending.clear()
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                headers["content-encoding"] = encoding
+                add_vary(headers, "Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["etag"] = encoded_etag(etag, encoding)
+                if not more_body:
+                    compressed = compress_body(body, encoding)
+                    headers["content-length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                if "content-length" in headers:
+                    del headers["content-length"]
+                compressor = CONTENT_ENCODERS[encoding]()
+                await send(start)
+            else:
+                body = message.get("body", b"")
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.flush()
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _revalidation_scope(scope: Scope, encoding: str) -> Tuple[Scope, Set[str]]:
+        """Add identity forms of If-None-Match tags encoded for `encoding`."""
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if not if_none_match:
+            return scope, set()
+        suffix = f'-{encoding}"'
+        tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        held = {tag for tag in tags if tag.endswith(suffix)}
+        if not held:
+            return scope, held
+        identity = [tag[: -len(suffix)] + '"' for tag in held]
+        headers = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+        value = ", ".join([if_none_match, *identity])
+        headers.append((b"if-none-match", value.encode("latin-1")))
+        return {**scope, "headers": headers}, held
+
+
+# --------------------
+# CORS
+# --------------------
+CORS_ALLOW_METHODS = "GET, POST, PUT, DELETE, OPTIONS"
+CORS_ALLOW_HEADERS = "Content-Type, Authorization"
+
+
+class CORSHeadersMiddleware:
+    """
+    CORS for every HTTP response.
+
+    Callers' origins are echoed back with credentials allowed (or `*` when
+    there is no Origin). With CORS_RESTRICT_ORIGINS on, only origins in
+    ALLOWED_ORIGINS are echoed and others get no Access-Control-Allow-Origin.
+    Any OPTIONS request is answered here as a preflight, with
+    Access-Control-Max-Age so browsers can reuse it.
+    Headers are added to the response start message only; bodies, including
+    streamed ones, pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allowed_origins: Optional[List[str]] = (
+            ALLOWED_ORIGINS if CORS_RESTRICT_ORIGINS else None
+        ),
+        max_age: int = CORS_MAX_AGE,
+    ):
+        self.app = app
+        # None echoes every origin.
+        self.allowed_origins = (
+            frozenset(allowed_origins) if allowed_origins is not None else None
+        )
+        self.max_age = str(max_age)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value.decode("latin-1")
+                break
+
+        if scope["method"] == "OPTIONS":
+            headers = MutableHeaders(raw=[])
+            self.apply(headers, origin)
+            headers["Access-Control-Max-Age"] = self.max_age
+            headers["Content-Length"] = "0"
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": headers.raw}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.apply(MutableHeaders(scope=message), origin)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    def apply(self, headers: MutableHeaders, origin: Optional[str]) -> None:
+        if origin:
+            add_vary(headers, "Origin")
+            if self.allowed_origins is not None and origin not in self.allowed_origins:
+                return
+            headers["Access-Control-Allow-Origin"] = origin  # echo caller
+            headers["Access-Control-Allow-Credentials"] = "true"
+        else:
+            headers["Access-Control-Allow-Origin"] = "*"
+        headers["Access-Control-Allow-Methods"] = CORS_ALLOW_METHODS
+        headers["Access-Control-Allow-Headers"] = CORS_ALLOW_HEADERS
+
+
+# --------------------
+# Upload storage
+# --------------------
+class StoredFile(NamedTuple):
+    name: str
+    size: int
+    mtime_ns: int
+
+
+def clean_storage_name(name: str) -> Optional[str]:
+    """Normalise a relative upload path, rejecting anything that escapes it."""
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+    if not parts or ".." in parts:
+        return None
+    return "/".join(parts)
+
+
+class LocalStorage:
+    """
+    Files in a directory on this host, served by a StaticFiles mount.
+
+    Like S3Storage, every method blocks; call them from the threadpool.
+    """
+
+    remote = False
+
+    def __init__(self, root: Path, route_name: str):
+        self.root = root
+        self.route_name = route_name
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, name: str) -> Path:
+        cleaned = clean_storage_name(name)
+        if cleaned is None:
+            raise ValueError(f"Invalid storage name: {name!r}")
+        return self.root / cleaned
+
+    def save_file(self, src: Path, name: str) -> int:
+        """Move a finished local file into storage and return its size."""
+        dest = self.path(name)
+        if dest.exists():
+            # Content-addressed names: same name means same bytes.
+            src.unlink(missing_ok=True)
+            os.utime(dest)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), str(dest))
+        return dest.stat().st_size
+
+    def save_stream(self, name: str, stream: IO[bytes]) -> None:
+        dest = self.path(name)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with dest.open("wb") as out_file:
+            shutil.copyfileobj(stream, out_file, BACKUP_CHUNK_SIZE)
+
+    def open(self, name: str) -> IO[bytes]:
+        return self.path(name).open("rb")
+
+    def touch(self, name: str) -> bool:
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def delete(self, name: str) -> None:
+        self.path(name).unlink(missing_ok=True)
+
+    def list(self) -> List[StoredFile]:
+        files = []
+        for path in sorted(self.root.rglob("*")):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if path.is_file() and not path.name.startswith("."):
+                name = path.relative_to(self.root).as_posix()
+                files.append(StoredFile(name, stat.st_size, stat.st_mtime_ns))
+        return files
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return self.path(name)
+
+    def url(self, name: str, request: Optional[Request] = None) -> str:
+        relative_url = f"/{self.route_name}/{name}"
+        if UPLOAD_BASE_URL:
+            return f"{UPLOAD_BASE_URL.rstrip('/')}{relative_url}"
+        # Derive absolute URL from the current request so clients get a
+        # fully-qualified link even when the backend is on a separate host.
+        try:
+            return str(request.url_for(self.route_name, path=name))
+        except Exception:
+            return relative_url
+
+
+class S3Storage:
+    """
+    Objects under `{route_name}/` in an S3-compatible bucket (AWS, MinIO, R2).
+
+    Files go up with multipart uploads from disk or from a stream, so nothing
+    is buffered whole. Public URLs point at S3_PUBLIC_BASE_URL (a CDN or a
+    public bucket) when set; otherwise at the backend's own /{route_name}
+    route, which redirects to a short-lived presigned URL, keeping the URLs
+    stored in content rows stable.
+    """
+
+    remote = True
+
+    def __init__(self, client: Any, bucket: str, route_name: str):
+        self.client = client
+        self.bucket = bucket
+        self.route_name = route_name
+        self.prefix = f"{route_name}/"
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=S3_MULTIPART_CHUNK_SIZE,
+        )
+
+    def key(self, name: str) -> str:
+        cleaned = clean_storage_name(name)
+        if cleaned is None:
+            raise ValueError(f"Invalid storage name: {name!r}")
+        return f"{self.prefix}{cleaned}"
+
+    def _extra_args(self, name: str) -> Dict[str, str]:
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        return {"ContentType": content_type, "CacheControl": UPLOAD_CACHE_CONTROL}
+
+    def _missing(self, exc: ClientError) -> bool:
+        code = exc.response.get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def exists(self, name: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(name))
+        except ClientError as exc:
+            if self._missing(exc):
+                return False
+            raise
+        return True
+
+    def save_file(self, src: Path, name: str) -> int:
+        size = src.stat().st_size
+        try:
+            if self.exists(name):
+                self.touch(name)
+            else:
+                self.client.upload_file(
+                    str(src),
+                    self.bucket,
+                    self.key(name),
+                    ExtraArgs=self._extra_args(name),
+                    Config=self.transfer_config,
+                )
+        finally:
+            src.unlink(missing_ok=True)
+        return size
+
+    def save_stream(self, name: str, stream: IO[bytes]) -> None:
+        self.client.upload_fileobj(
+            stream,
+            self.bucket,
+            self.key(name),
+            ExtraArgs=self._extra_args(name),
+            Config=self.transfer_config,
+        )
+
+    def open(self, name: str) -> IO[bytes]:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self.key(name))["Body"]
+        except ClientError as exc:
+            if self._missing(exc):
+                raise FileNotFoundError(name) from exc
+            raise
+
+    def touch(self, name: str) -> bool:
+        # S3 has no utime; copying an object onto itself refreshes LastModified.
+        key = self.key(name)
+        try:
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={"Bucket": self.bucket, "Key": key},
+                MetadataDirective="REPLACE",
+                **self._extra_args(name),
+            )
+        except ClientError as exc:
+            if self._missing(exc):
+                return False
+            raise
+        return True
+
+    def delete(self, name: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
+
+    def list(self) -> List[StoredFile]:
+        files = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                name = item["Key"][len(self.prefix) :]
+                if name and not name.endswith("/"):
+                    mtime_ns = int(item["LastModified"].timestamp() * 1_000_000_000)
+                    files.append(StoredFile(name, item["Size"], mtime_ns))
+        return files
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return None
+
+    def presigned_url(self, name: str) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self.key(name)},
+            ExpiresIn=S3_PRESIGN_EXPIRES,
+        )
+
+    def url(self, name: str, request: Optional[Request] = None) -> str:
+        if S3_PUBLIC_BASE_URL:
+            return f"{S3_PUBLIC_BASE_URL.rstrip('/')}/{self.key(name)}"
+        relative_url = f"/{self.route_name}/{name}"
+        if UPLOAD_BASE_URL:
+            return f"{UPLOAD_BASE_URL.rstrip('/')}{relative_url}"
+        try:
+            return str(request.url_for(self.route_name, path=name))
+        except Exception:
+            return relative_url
+
+
+def create_storage(local_root: Path, route_name: str) -> Union[LocalStorage, S3Storage]:
+    if UPLOAD_STORAGE == "local":
+        return LocalStorage(local_root, route_name)
+    if UPLOAD_STORAGE != "s3":
+        raise RuntimeError(f"Unknown UPLOAD_STORAGE: {UPLOAD_STORAGE}")
+    if boto3 is None:
+        raise RuntimeError("UPLOAD_STORAGE=s3 requires boto3")
+    if not S3_BUCKET:
+        raise RuntimeError("UPLOAD_STORAGE=s3 requires S3_BUCKET")
+    client = boto3.client(
+        "s3",
+        endpoint_url=S3_ENDPOINT_URL,
+        region_name=S3_REGION,
+        aws_access_key_id=S3_ACCESS_KEY_ID,
+        aws_secret_access_key=S3_SECRET_ACCESS_KEY,
+        config=BotoConfig(
+            signature_version="s3v4",
+            max_pool_connections=32,
+            # MinIO and most self-hosted stores only do path-style buckets
+            s3={"addressing_style": "path" if S3_ENDPOINT_URL else "auto"},
+        ),
+    )
+    return S3Storage(client, S3_BUCKET, route_name)
+
+
+upload_storage = create_storage(UPLOAD_DIR, "uploads")
+derived_storage = create_storage(DERIVED_DIR, "derived")
+
+
+# --------------------
+# Image derivatives
+# --------------------
+class DerivativeStore:
+    """
+    Resized WebP/AVIF copies of uploaded images (and .br/.gz copies of
+    SVG-like ones), generated on a process pool.
+
+    Each processed upload gets a JSON sidecar next to its files in the
+    derived storage, which doubles as the cache: it survives restarts and is
+    shared by every worker and replica. Lookups are memoised per process; an
+    upload not seen yet is resolved in the background (sidecar read, or
+    generation) and reported without variants until that finishes.
+    """
+
+    def __init__(
+        self, storage: Union[LocalStorage, S3Storage], staging_dir: Path, workers: int
+    ):
+        self.storage = storage
+        self.staging_dir = staging_dir
+        self.workers = workers
+        self.enabled = workers > 0 and image_derivatives.pillow_available()
+        if self.enabled:
+            usable = image_derivatives.supported_formats(IMAGE_DERIVATIVE_FORMATS)
+            skipped = [fmt for fmt in IMAGE_DERIVATIVE_FORMATS if fmt not in usable]
+            if skipped:
+                logger.warning(
+                    "Pillow cannot write %s; no such image derivatives will be made",
+                    ", ".join(skipped),
+                )
+        self._known: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps the app's engine, sockets and threads out of the workers
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _submit(self, source: Path, name: str) -> Future:
+        job = (
+            image_derivatives.generate_derivatives,
+            str(source),
+            name,
+            str(self.staging_dir),
+            IMAGE_DERIVATIVE_WIDTHS,
+            IMAGE_DERIVATIVE_FORMATS,
+            IMAGE_DERIVATIVE_QUALITY,
+        )
+        try:
+            return self._pool().submit(*job)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); start a fresh pool.
+            self._executor = None
+            return self._pool().submit(*job)
+
+    def derivable(self, name: str) -> bool:
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix in image_derivatives.PRECOMPRESS_SUFFIXES:
+            return self.workers > 0
+        return self.enabled and suffix in image_derivatives.DERIVABLE_SUFFIXES
+
+    def schedule(self, name: str) -> Optional[asyncio.Task]:
+        """Resolve an upload's derivatives in the background unless known or queued."""
+        if not self.derivable(name) or name in self._known:
+            return None
+        task = self._pending.get(name)
+        if task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            task = loop.create_task(self._resolve(name))
+            self._pending[name] = task
+        return task
+
+    def _read_sidecar(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self.storage.open(f"{name}{image_derivatives.SIDECAR_SUFFIX}") as handle:
+                return json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _fetch_source(self, name: str) -> Tuple[Optional[Path], bool]:
+        """Return a local path for the upload and whether it is a temp copy."""
+        local = upload_storage.local_path(name)
+        if local is not None:
+            return (local if local.is_file() else None), False
+        fd, tmp_name = tempfile.mkstemp(prefix="derive-", dir=UPLOAD_TMP_DIR)
+        try:
+            with os.fdopen(fd, "wb") as out_file, upload_storage.open(name) as source:
+                shutil.copyfileobj(source, out_file, BACKUP_CHUNK_SIZE)
+        except FileNotFoundError:
+            Path(tmp_name).unlink(missing_ok=True)
+            return None, False
+        return Path(tmp_name), True
+
+    def _publish(self, name: str, record: Dict[str, Any]) -> None:
+        """Move staged files into remote storage, sidecar last."""
+        sidecar = f"{name}{image_derivatives.SIDECAR_SUFFIX}"
+        for filename in image_derivatives.sidecar_files(record) + [sidecar]:
+            self.storage.save_file(self.staging_dir / filename, filename)
+
+    async def _resolve(self, name: str) -> None:
+        record = None
+        try:
+            record = await run_in_threadpool(self._read_sidecar, name)
+            if record is None:
+                source, is_temp = await run_in_threadpool(self._fetch_source, name)
+                if source is None:
+                    record = {}
+                else:
+                    try:
+                        record = await asyncio.wrap_future(self._submit(source, name))
+                    finally:
+                        if is_temp:
+                            await run_in_threadpool(source.unlink, True)
+                    if record is not None and self.storage.remote:
+                        await run_in_threadpool(self._publish, name, record)
+        except Exception:
+            # Settle as "no derivatives" rather than leave the upload pending:
+            # responses that touch a pending upload are never cached.
+            record = {}
+        finally:
+            self._pending.pop(name, None)
+        if record is not None:
+            with self._lock:
+                self._known[name] = record
+
+    def record(self, name: str) -> Dict[str, Any]:
+        """The upload's sidecar record, or {} while it is still being resolved."""
+        known = self._known.get(name)
+        if known is not None:
+            return known
+        if self.schedule(name) is not None:
+            derivatives_pending.set(True)
+        return {}
+
+    async def lookup(self, name: str) -> Dict[str, Any]:
+        """Like record(), but reads an existing sidecar before answering."""
+        known = self._known.get(name)
+        if known is not None or not self.derivable(name) or name in self._pending:
+            return known or {}
+        known = await run_in_threadpool(self._read_sidecar, name)
+        if known is None:
+            self.schedule(name)
+            return {}
+        with self._lock:
+            self._known[name] = known
+        return known
+
+    def resolved(self, name: str) -> bool:
+        return name in self._known
+
+    def variants(self, name: str) -> List[Dict[str, Any]]:
+        return self.record(name).get("variants", [])
+
+    def discard(self, name: str) -> None:
+        """Delete an upload's derived files and sidecar (blocking)."""
+        for filename in image_derivatives.sidecar_files(self._read_sidecar(name) or {}):
+            self.storage.delete(filename)
+        self.storage.delete(f"{name}{image_derivatives.SIDECAR_SUFFIX}")
+        with self._lock:
+            self._known.pop(name, None)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+derivative_store = DerivativeStore(derived_storage, DERIVED_DIR, IMAGE_WORKERS)
+# Set by DerivativeStore.record() while building a response that used an
+# upload whose derivatives are still being resolved (see cached_json).
+derivatives_pending: ContextVar[bool] = ContextVar("derivatives_pending", default=False)
+
+
+def upload_name_from_url(url: str) -> Optional[str]:
+    """Return the file name of an image served from /uploads, else None."""
+    path = url.split("?", 1)[0].split("#", 1)[0]
+    _, sep, name = path.rpartition("/uploads/")
+    if not sep or not name or "/" in name:
+        return None
+    return name
+
+
+def image_variants(images: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Map each local upload URL to its derivative URLs (same host, /derived/),
+    as plain ImageVariant-shaped dicts.
+    """
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    for url in images:
+        name = upload_name_from_url(url)
+        if not name:
+            continue
+        variants = derivative_store.variants(name)
+        if not variants:
+            continue
+        base = url[: url.rindex("/uploads/")]
+        result[url] = [
+            {
+                "url": f"{base}/derived/{variant['file']}",
+                "width": variant["width"],
+                "format": variant["format"],
+            }
+            for variant in variants
+        ]
+    return result
+
+
+# --------------------
+# Outbound HTTP
+# --------------------
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    The process-wide outbound client, so upstream calls reuse pooled
+    keep-alive (and HTTP/2) connections instead of reconnecting each time.
+    Opened by the app lifespan, or on first use outside it; closed on
+    shutdown. Also usable as a FastAPI dependency.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP_CLIENT_HTTP2 and h2 is not None,
+            timeout=httpx.Timeout(HTTP_CLIENT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# --------------------
+# CoinGecko proxy helpers
+# --------------------
+class TokenBucket:
+    """
+    Rate limiter for an upstream API: `rate` calls per second with bursts of
+    up to `capacity`, tracked as the time the next call is due (GCRA).
+
+    acquire() reserves a slot and sleeps until it comes up. pause() (after a
+    429) shifts every reserved slot, and the next due time, past the pause,
+    so waiting callers keep their place and calls resume one interval apart
+    instead of in a burst.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.interval = 1.0 / rate
+        self.burst = (max(capacity, 1) - 1) * self.interval
+        self.next_due = 0.0
+        self.paused_until = 0.0
+        # Total time reserved slots have been pushed back by pauses.
+        self.shifted = 0.0
+
+    async def acquire(self, max_wait: float = float("inf")) -> bool:
+        """
+        Wait for a slot; False, without taking one, if it is over max_wait
+        away. A reserved slot is always waited out, even if a later pause
+        moves it past max_wait.
+        """
+        now = time.monotonic()
+        start = max(now, self.next_due - self.burst, self.paused_until)
+        if start > now + max_wait:
+            return False
+        self.next_due = max(self.next_due, start) + self.interval
+        shifted = self.shifted
+        while start > now:
+            await asyncio.sleep(start - now)
+            # Follow our slot if a pause moved it while we slept.
+            start += self.shifted - shifted
+            shifted = self.shifted
+            now = time.monotonic()
+        return True
+
+    def pause(self, seconds: float) -> None:
+        now = time.monotonic()
+        until = now + seconds
+        delta = until - max(now, self.paused_until)
+        if delta <= 0:
+            return
+        self.paused_until = until
+        self.shifted += delta
+        self.next_due = max(self.next_due + delta, until + self.burst)
+
+
+coingecko_bucket = TokenBucket(COINGECKO_RATE_PER_SECOND, COINGECKO_BURST)
+
+
+class CoinGeckoThrottled(Exception):
+    """The rate limiter would have made this call wait past its max_wait."""
+
+
+def retry_after_seconds(response: httpx.Response) -> float:
+    try:
+        return max(float(response.headers["retry-after"]), 0.0)
+    except (KeyError, ValueError):
+        return COINGECKO_THROTTLE_PAUSE
+
+
+async def fetch_coingecko_json(
+    path: str, client: httpx.AsyncClient, max_wait: float = COINGECKO_MAX_WAIT
+) -> Any:
+    if not await coingecko_bucket.acquire(max_wait):
+        raise CoinGeckoThrottled(path)
+    url = f"{COINGECKO_BASE_URL}{path}"
+    response = await client.get(
+        url,
+        headers={"accept": "application/json", "user-agent": COINGECKO_USER_AGENT},
+    )
+    if response.status_code == 429:
+        coingecko_bucket.pause(retry_after_seconds(response))
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_volume_change(
+    coin_id: str, client: httpx.AsyncClient, max_wait: float = float("inf")
+) -> Optional[float]:
+    chart = await fetch_coingecko_json(
+        f"/coins/{coin_id}/market_chart?vs_currency=usd&days=2&interval=daily",
+        client,
+        max_wait,
+    )
+    volumes: list = chart.get("total_volumes") or []
+    if not isinstance(volumes, list) or len(volumes) < 2:
+        return None
+
+    try:
+        prev = volumes[-2][1]
+        latest = volumes[-1][1]
+        if isinstance(prev, (int, float)) and isinstance(latest, (int, float)) and prev > 0:
+            return ((latest - prev) / prev) * 100
+    except Exception:
+        return None
+
+    return None
+
+
+class VolumeChangeCache:
+    """
+    Per-coin volumeChange24h results with their own TTL, bounded as an LRU.
+    A computed None (not enough chart data) is cached too; failed fetches
+    are not.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Optional[float]]]" = OrderedDict()
+
+    def get(self, coin_id: str) -> Tuple[bool, Optional[float]]:
+        """Return (hit, value) for a coin."""
+        entry = self._entries.get(coin_id)
+        if entry is None:
+            return False, None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[coin_id]
+            return False, None
+        self._entries.move_to_end(coin_id)
+        return True, entry[1]
+
+    def set(self, coin_id: str, value: Optional[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[coin_id] = (time.monotonic(), value)
+        self._entries.move_to_end(coin_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+volume_change_cache = VolumeChangeCache(
+    COINGECKO_VOLUME_CACHE_SECONDS, COINGECKO_VOLUME_CACHE_MAX_ENTRIES
+)
+
+
+async def sampled_volume_change(
+    coin_id: str, client: httpx.AsyncClient, slots: asyncio.Semaphore
+) -> Optional[float]:
+    """
+    get_volume_change through volume_change_cache. A 429 pauses the limiter
+    and the coin is retried once after the pause, as is a call the limiter
+    turned away.
+    """
+    hit, cached = volume_change_cache.get(coin_id)
+    if hit:
+        return cached
+    async with slots:
+        for _ in range(2):
+            try:
+                value = await get_volume_change(coin_id, client)
+                volume_change_cache.set(coin_id, value)
+                return value
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 429:
+                    return None
+            except CoinGeckoThrottled:
+                continue
+            except Exception:
+                # ignore per-coin chart failures
+                return None
+    return None
+
+
+async def load_market_rows() -> List[Dict[str, Any]]:
+    client = get_http_client()
+    markets = await fetch_coingecko_json(
+        f"/coins/markets?vs_currency=usd&order=volume_desc&per_page={COINGECKO_MARKET_LIMIT}&page=1&sparkline=false&price_change_percentage=24h",
+        client,
+    )
+    markets = markets[:COINGECKO_MARKET_LIMIT]
+
+    # Chart calls run concurrently; the token bucket spaces them out.
+    slots = asyncio.Semaphore(COINGECKO_CONCURRENCY)
+    volume_changes = await asyncio.gather(
+        *[
+            sampled_volume_change(coin.get("id", ""), client, slots)
+            for coin in markets[:COINGECKO_VOLUME_SAMPLE_LIMIT]
+        ]
+    )
+
+    rows: List[Dict[str, Any]] = []
+    for idx, coin in enumerate(markets):
+        rows.append(
+            {
+                "id": coin.get("id"),
+                "name": coin.get("name"),
+                "symbol": str(coin.get("symbol", "")).upper(),
+                "image": coin.get("image"),
+                "price": coin.get("current_price"),
+                "priceChange24h": coin.get("price_change_percentage_24h"),
+                "volume": coin.get("total_volume"),
+                "volumeChange24h": volume_changes[idx]
+                if idx < len(volume_changes)
+                else None,
+            }
+        )
+    return rows
+
+
+async def _refresh_market_rows() -> None:
+    try:
+        rows = await load_market_rows()
+    except Exception as exc:
+        _coingecko_cache.update({"error": str(exc), "failed_ts": time.time()})
+        raise
+    _coingecko_cache.update(
+        {
+            "rows": rows,
+            "ts": time.time(),
+            "as_of": datetime.utcnow().isoformat() + "Z",
+            "error": None,
+        }
+    )
+
+
+def refresh_market_data() -> "asyncio.Task[None]":
+    """
+    Start a market refresh unless one is already running, and return it, so
+    concurrent callers share a single upstream fetch. After a failed refresh
+    with rows still cached, the next one waits COINGECKO_THROTTLE_PAUSE.
+    """
+    global _market_refresh
+    task = _market_refresh
+    if task is not None and not task.done():
+        return task
+    if (
+        task is not None
+        and _coingecko_cache["rows"]
+        and time.time() - _coingecko_cache["failed_ts"] < COINGECKO_THROTTLE_PAUSE
+    ):
+        return task
+    task = asyncio.create_task(_refresh_market_rows())
+    # Callers may all have returned stale rows; mark the error as seen.
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+    _market_refresh = task
+    return task
+
+
+async def keep_market_data_warm() -> None:
+    """Refresh market rows at 80% of their TTL until cancelled."""
+    while True:
+        try:
+            await refresh_market_data()
+        except Exception:
+            pass  # kept in _coingecko_cache["error"]; stale rows are still served
+        await asyncio.sleep(COINGECKO_CACHE_SECONDS * 0.8)
+
+
+# --------------------
+# App
+# --------------------
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await check_schema_version()
+    get_http_client()
+    warm = (
+        asyncio.create_task(keep_market_data_warm())
+        if COINGECKO_BACKGROUND_REFRESH
+        else None
+    )
+    yield
+    if warm is not None:
+        warm.cancel()
+    await close_http_client()
+    derivative_store.shutdown()
+
+
+app = FastAPI(title="GTN FastAPI Backend", lifespan=lifespan)
+
+
+class UploadFiles(StaticFiles):
+    """
+    StaticFiles for stored uploads and derivatives.
+
+    Stored names never change content, so every response is cacheable
+    forever, and FileResponse already answers Range requests. With a
+    `derived` store, a .br/.gz copy (for SVG-like files) or a full-size WebP
+    copy (for JPEG/PNG) is served in place of the original when the
+    client's Accept-Encoding/Accept allow it. Derivable uploads always
+    carry the same Vary header, and are not marked immutable while their
+    derivatives are still being resolved.
+    """
+
+    def __init__(self, *, derived: Optional[LocalStorage] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.derived = derived
+
+    def _negotiate(
+        self, path: str, headers: Headers, record: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """Return (file, media type, extra headers) of the variant to serve, if any."""
+        encodings = record.get("encodings", [])
+        full_webp = [
+            item["file"]
+            for item in record.get("variants", [])
+            if item["format"] == "webp" and item["width"] == record.get("width")
+        ]
+        if Path(path).suffix.lower() == ".webp":
+            full_webp = []
+
+        if encodings:
+            accepted = accepted_tokens(headers.get("accept-encoding", ""))
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            for item in encodings:
+                if accepted.get(item["encoding"], 0) > 0:
+                    extra = {"content-encoding": item["encoding"]}
+                    return item["file"], media_type, extra
+            return None
+        if full_webp:
+            if accepted_tokens(headers.get("accept", "")).get("image/webp", 0) > 0:
+                return full_webp[0], "image/webp", {}
+        return None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        headers = Headers(scope=scope)
+        variant, derivable, pending = None, False, False
+        if self.derived and derivative_store.derivable(path):
+            derivable = True
+            record = await derivative_store.lookup(path)
+            pending = not derivative_store.resolved(path)
+            variant = self._negotiate(path, headers, record)
+        response = None
+        if variant is not None:
+            filename, media_type, extra = variant
+            file_path = self.derived.path(filename)
+            try:
+                stat_result = await run_in_threadpool(os.stat, file_path)
+            except FileNotFoundError:
+                stat_result = None
+            if stat_result is not None:
+                response = FileResponse(
+                    file_path,
+                    stat_result=stat_result,
+                    media_type=media_type,
+                    headers=extra,
+                )
+                if self.is_not_modified(response.headers, headers):
+                    response = NotModifiedResponse(response.headers)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            if pending:
+                response.headers["cache-control"] = UPLOAD_PENDING_CACHE_CONTROL
+            else:
+                response.headers["cache-control"] = UPLOAD_CACHE_CONTROL
+            if derivable:
+                add_vary(response.headers, UPLOAD_VARY)
+        return response
+
+
+def serve_storage(
+    storage: Union[LocalStorage, S3Storage], derived: Optional[LocalStorage] = None
+) -> None:
+    route = f"/{storage.route_name}"
+    if not storage.remote:
+        app.mount(
+            route,
+            UploadFiles(directory=str(storage.root), derived=derived),
+            name=storage.route_name,
+        )
+        return
+
+    async def redirect_to_object(path: str):
+        if clean_storage_name(path) is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        # Cacheable, but only for part of the presigned URL's lifetime.
+        return RedirectResponse(
+            storage.presigned_url(path),
+            status_code=307,
+            headers={"cache-control": f"public, max-age={S3_PRESIGN_EXPIRES // 2}"},
+        )
+
+    app.add_api_route(
+        f"{route}/{{path:path}}",
+        redirect_to_object,
+        methods=["GET"],
+        name=storage.route_name,
+        include_in_schema=False,
+    )
+
+
+serve_storage(
+    upload_storage, derived=None if derived_storage.remote else derived_storage
+)
+serve_storage(derived_storage)
+
+
+app.add_middleware(CORSHeadersMiddleware)
+# Outermost, so CORS headers are already in place and the body is final.
+app.add_middleware(CompressionMiddleware)
+
+
+@app.get("/api/health")
+async def health(db: AsyncSession = Depends(get_db)):
+    try:
+        await db.execute(text("SELECT 1"))
+        return {"success": True, "status": "ok"}
+    except Exception as exc:  # pragma: no cover - simple connectivity check
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.post("/api/login")
+async def login(request: Request, response: Response):
+    data = {}
+    if request.headers.get("content-type", "").startswith("application/json"):
+        data = await request.json()
+    else:
+        data = dict(await request.form())
+
+    username = (data.get("username") or "").strip()
+    password = data.get("password") or ""
+
+    is_admin = (username == ADMIN_USER and password == ADMIN_PASS) or (
+        username == SUPER_ADMIN_USER and password == SUPER_ADMIN_PASS
+    )
+
+    if is_admin:
+        token = create_session_token(username)
+        response.set_cookie(
+            COOKIE_NAME,
+            token,
+            max_age=SESSION_TTL_SECONDS,
+            httponly=True,
+            secure=COOKIE_SECURE,
+            samesite=COOKIE_SAMESITE,
+        )
+        return {"success": True}
+
+    raise HTTPException(status_code=401, detail="Invalid credentials")
+
+
+@app.post("/api/logout")
+def logout(response: Response):
+    response.delete_cookie(COOKIE_NAME)
+    return {"success": True}
+
+
+@app.get("/api/session")
 def session(request: Request):
     token = request.cookies.get(COOKIE_NAME)
     return {"authenticated": bool(token and validate_session_token(token))}
 
 
-@app.post("/api/upload")
-async def upload_file(
-    _: bool = Depends(require_admin),
-    file: UploadFile = File(...),
-    request: Request = None,
-):
-    if not file:
+# --------------------
+# Upload ingestion
+# --------------------
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+    (b"\x00\x00\x01\x00", ".ico"),
+)
+ISO_IMAGE_BRANDS = {b"avif": ".avif", b"avis": ".avif", b"heic": ".heic", b"heix": ".heic"}
+IMAGE_SNIFF_BYTES = 512
+
+
+def detect_image_type(head: bytes) -> Optional[str]:
+    """Return the file extension for an image header, or None if unrecognised."""
+    for signature, ext in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:8] == b"ftyp" and head[8:12] in ISO_IMAGE_BRANDS:
+        return ISO_IMAGE_BRANDS[head[8:12]]
+    text_head = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if text_head.startswith((b"<svg", b"<?xml", b"<!doctype svg")) and b"<svg" in text_head:
+        return ".svg"
+    return None
+
+
+class _UploadPart:
+    """Collects the `file` part of a multipart body as the parser emits it."""
+
+    def __init__(self) -> None:
+        self.filename: Optional[str] = None
+        self.found = False
+        self.size = 0
+        self.head = b""
+        self.pending: List[bytes] = []
+        self._in_file = False
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+
+    def callbacks(self) -> Dict[str, Callable[..., None]]:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        }
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._in_file = (
+            not self.found and options.get(b"name") == b"file" and b"filename" in options
+        )
+        if self._in_file:
+            self.found = True
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file:
+            return
+        chunk = data[start:end]
+        if len(self.head) < IMAGE_SNIFF_BYTES:
+            self.head += chunk[: IMAGE_SNIFF_BYTES - len(self.head)]
+        self.size += len(chunk)
+        self.pending.append(chunk)
+
+    def _on_part_end(self) -> None:
+        self._in_file = False
+
+
+def _write_upload_chunks(out_file: IO[bytes], hasher: Any, chunks: List[bytes]) -> None:
+    for chunk in chunks:
+        hasher.update(chunk)
+        out_file.write(chunk)
+
+
+def _discard_upload(out_file: IO[bytes], tmp_path: Path) -> None:
+    out_file.close()
+    tmp_path.unlink(missing_ok=True)
+
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)",
+    )
+
+
+async def receive_upload(request: Request) -> Tuple[Path, str, str, str]:
+    """
+    Stream the multipart `file` field to a temp file.
+
+    The body is parsed as it arrives and written in chunks from the
+    threadpool, so only one network chunk is held in memory at a time and
+    oversized uploads are rejected as soon as they cross MAX_UPLOAD_BYTES.
+    Returns the temp path, the client filename, the sniffed extension and
+    the SHA-256 of the file.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
         raise HTTPException(status_code=400, detail="No file received")
 
-    if not (file.content_type or "").startswith("image/"):
-        raise HTTPException(status_code=400, detail="Only image files allowed")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES + UPLOAD_FORM_OVERHEAD:
+        raise _upload_too_large()
+
+    part = _UploadPart()
+    parser = MultipartParser(boundary, part.callbacks())
+    UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix="upload-", suffix=".part", dir=UPLOAD_TMP_DIR)
+    tmp_path = Path(tmp_name)
+    out_file = os.fdopen(fd, "wb")
+    hasher = hashlib.sha256()
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if part.size > MAX_UPLOAD_BYTES:
+                raise _upload_too_large()
+            if sum(len(data) for data in part.pending) >= UPLOAD_CHUNK_SIZE:
+                await run_in_threadpool(
+                    _write_upload_chunks, out_file, hasher, part.pending
+                )
+                part.pending = []
+        parser.finalize()
+        if part.pending:
+            await run_in_threadpool(_write_upload_chunks, out_file, hasher, part.pending)
+            part.pending = []
+        await run_in_threadpool(out_file.close)
+
+        if not part.found or not part.size:
+            raise HTTPException(status_code=400, detail="No file received")
+        ext = detect_image_type(part.head)
+        if not ext:
+            raise HTTPException(status_code=400, detail="Only image files allowed")
+    except BaseException:
+        await run_in_threadpool(_discard_upload, out_file, tmp_path)
+        raise
+
+    return tmp_path, part.filename or "file", ext, hasher.hexdigest()
+
+
+# upload_file parses the multipart body itself (receive_upload), so the
+# request body FastAPI would have derived from a File() parameter is declared here.
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
 
-    original_name = Path(file.filename or "file").name
-    ext = "".join(Path(original_name).suffixes)
-    safe_name = "".join(c for c in Path(original_name).stem if c.isalnum() or c in ("-", "_"))
-    final_name = f"{int(time.time())}_{safe_name or 'file'}_{secrets.token_hex(4)}{ext}"
-    dest = UPLOAD_DIR / final_name
 
-    with dest.open("wb") as out_file:
-        content = await file.read()
-        out_file.write(content)
+@app.post("/api/upload", openapi_extra=UPLOAD_OPENAPI)
+async def upload_file(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    tmp_path, original_name, ext, digest = await receive_upload(request)
 
-    relative_url = f"/uploads/{final_name}"
-    if UPLOAD_BASE_URL:
-        public_url = f"{UPLOAD_BASE_URL.rstrip('/')}{relative_url}"
+    # Uploads are stored by content hash, so identical bytes are kept once.
+    existing = await db.scalar(
+        select(UploadObject.name).where(UploadObject.sha256 == digest).limit(1)
+    )
+    # Touching the reused file keeps a concurrent GC pass from removing it.
+    deduplicated = bool(existing) and await run_in_threadpool(
+        upload_storage.touch, existing
+    )
+    if deduplicated:
+        await run_in_threadpool(tmp_path.unlink, True)
+        final_name = existing
     else:
-        # Derive absolute URL from the current request so clients get a
-        # fully-qualified link even when the backend is on a separate host.
+        final_name = f"{digest}{ext}"
         try:
-            public_url = str(request.url_for("uploads", path=final_name))
+            size = await run_in_threadpool(upload_storage.save_file, tmp_path, final_name)
         except Exception:
-            public_url = relative_url
+            await run_in_threadpool(tmp_path.unlink, True)
+            raise HTTPException(status_code=500, detail="Could not store upload")
+        await db.execute(
+            pg_insert(UploadObject)
+            .values(
+                name=final_name,
+                sha256=digest,
+                size=size,
+                original_name=Path(original_name).name,
+            )
+            .on_conflict_do_nothing(index_elements=[UploadObject.name])
+        )
+        await db.commit()
+    derivative_store.schedule(final_name)
 
-    return {"success": True, "url": public_url}
+    public_url = upload_storage.url(final_name, request)
+    return {"success": True, "url": public_url, "deduplicated": deduplicated}
+
+
+# --------------------
+# Upload garbage collection
+# --------------------
+# Stored names (optionally in subdirectories, possibly percent-encoded) end
+# in an extension, so trailing prose punctuation like "a.png," or "a.png."
+# is never part of the match.
+UPLOAD_REF_PATTERN = re.compile(
+    r"/uploads/((?:[A-Za-z0-9._~%-]+/)*[A-Za-z0-9._~%-]*\.[A-Za-z0-9]+)"
+)
+
+# Every column that can hold an /uploads URL, per table.
+UPLOAD_REFERENCE_COLUMNS = (
+    (Project.logo_url,),
+    (Event.image_url, Event.image_urls, Event.description, Event.body),
+    (News.image_url, News.image_urls, News.description, News.body),
+    (Blog.image_url, Blog.excerpt, Blog.body),
+)
+
+
+def upload_refs(text: str) -> set:
+    """Upload paths referenced by /uploads/ URLs anywhere in `text`."""
+    return {unquote(match) for match in UPLOAD_REF_PATTERN.findall(text)}
+
+
+async def referenced_upload_names(db: AsyncSession) -> set:
+    """Collect the upload paths referenced by any project/event/news/blog row."""
+    names = set()
+    for columns in UPLOAD_REFERENCE_COLUMNS:
+        result = await db.stream(
+            select(*columns).execution_options(yield_per=BACKUP_YIELD_PER)
+        )
+        async for row in result:
+            for value in row:
+                for item in value if isinstance(value, list) else [value]:
+                    if item:
+                        names.update(upload_refs(item))
+    return names
+
+
+def _sweep_uploads(
+    referenced: set, cutoff_ns: int, dry_run: bool
+) -> Tuple[List[str], int, List[StoredFile]]:
+    removed: List[str] = []
+    kept: List[StoredFile] = []
+    freed = 0
+    for stored in upload_storage.list():
+        if stored.name in referenced or stored.mtime_ns > cutoff_ns:
+            kept.append(stored)
+            continue
+        removed.append(stored.name)
+        freed += stored.size
+        if not dry_run:
+            upload_storage.delete(stored.name)
+            derivative_store.discard(stored.name)
+    return removed, freed, kept
+
+
+def _hash_upload(name: str) -> str:
+    hasher = hashlib.sha256()
+    with upload_storage.open(name) as source:
+        for chunk in iter(lambda: source.read(BACKUP_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _index_upload_files(files: List[StoredFile]) -> List[Dict[str, Any]]:
+    rows = []
+    for stored in files:
+        try:
+            digest = _hash_upload(stored.name)
+        except FileNotFoundError:
+            continue
+        rows.append({"name": stored.name, "sha256": digest, "size": stored.size})
+    return rows
+
+
+@app.post("/api/uploads/gc")
+async def collect_uploads(
+    dry_run: bool = False,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    """
+    Delete uploads that no content row references, then reconcile the
+    upload index with the directory (dropping rows for missing files and
+    hashing files that arrived outside /api/upload, e.g. via restore).
+    """
+    referenced = await referenced_upload_names(db)
+    cutoff_ns = time.time_ns() - int(UPLOAD_GC_GRACE.total_seconds() * 1_000_000_000)
+    removed, freed, kept = await run_in_threadpool(
+        _sweep_uploads, referenced, cutoff_ns, dry_run
+    )
+
+    indexed = 0
+    if not dry_run:
+        known = set((await db.scalars(select(UploadObject.name))).all())
+        stale = known - {stored.name for stored in kept}
+        if stale:
+            await db.execute(delete(UploadObject).where(UploadObject.name.in_(stale)))
+        unindexed = [stored for stored in kept if stored.name not in known]
+        rows = await run_in_threadpool(_index_upload_files, unindexed)
+        if rows:
+            await db.execute(pg_insert(UploadObject).on_conflict_do_nothing(), rows)
+        indexed = len(rows)
+        await db.commit()
+
+    return {
+        "success": True,
+        "dry_run": dry_run,
+        "referenced": len(referenced),
+        "removed": removed,
+        "bytes_freed": freed,
+        "indexed": indexed,
+    }
 
 
 # --------------------
@@ -620,99 +2679,389 @@ def parse_image_list(image_urls: Optional[str]) -> List[str]:
     if not image_urls:
         return []
 
-    try:
-        data = json.loads(image_urls)
-    except json.JSONDecodeError:
-        return []
+    try:
+        data = json.loads(image_urls)
+    except json.JSONDecodeError:
+        return []
+
+    if not isinstance(data, list):
+        return []
+
+    cleaned = []
+    for item in data:
+        if isinstance(item, str):
+            url = item.strip()
+            if url:
+                cleaned.append(url)
+    return cleaned
+
+
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(created_raw) if created_raw else None
+        return created_at, int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def newest_first(stmt, model):
+    # Postgres sorts NULLs first on DESC; keep that and break ties on id so
+    # keyset pages are stable.
+    return stmt.order_by(model.created_at.desc().nulls_first(), model.id.desc())
+
+
+async def keyset_page(
+    db: AsyncSession, stmt, model, limit: int, cursor: Optional[str]
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one (created_at, id) keyset page of a newest-first listing."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if created_at is None:
+            stmt = stmt.where(
+                or_(
+                    and_(model.created_at.is_(None), model.id < row_id),
+                    model.created_at.isnot(None),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    model.created_at < created_at,
+                    and_(model.created_at == created_at, model.id < row_id),
+                )
+            )
+
+    result = await db.execute(newest_first(stmt, model).limit(limit + 1))
+    rows = list(result.scalars())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
+
+
+async def list_response(
+    db: AsyncSession,
+    stmt,
+    model,
+    serialize,
+    limit: Optional[int],
+    cursor: Optional[str],
+):
+    """
+    Return every row as a plain list when no paging params are given (the
+    shape existing clients expect), otherwise a Page-shaped dict.
+    """
+    if limit is None and cursor is None:
+        result = await db.execute(newest_first(stmt, model))
+        return [serialize(row) for row in result.scalars()]
+
+    rows, next_cursor = await keyset_page(
+        db, stmt, model, limit or DEFAULT_PAGE_LIMIT, cursor
+    )
+    return {"items": [serialize(row) for row in rows], "next_cursor": next_cursor}
+
+
+async def bump_content_version(db: AsyncSession, table: str) -> None:
+    """Advance a table's version inside the caller's transaction."""
+    stmt = pg_insert(ContentVersion).values(table_name=table, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ContentVersion.table_name],
+        set_={"version": ContentVersion.version + 1},
+    )
+    await db.execute(stmt)
+    response_cache.invalidate(table)
+
+
+async def content_etag(db: AsyncSession, table: str) -> str:
+    version = await db.scalar(
+        select(ContentVersion.version).where(ContentVersion.table_name == table)
+    )
+    return f'"{table}-{version or 0}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Any encoding of the current version is still current.
+    variants = {etag} | {encoded_etag(etag, encoding) for encoding in CONTENT_ENCODERS}
+    return any(
+        tag.strip().removeprefix("W/") in variants for tag in if_none_match.split(",")
+    )
+
+
+async def cached_json(
+    request: Request,
+    db: AsyncSession,
+    table: str,
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    """
+    Serve a public GET route from the table's ETag and the response cache.
+
+    Returns 304 when the client already holds the current version, the cached
+    body when this worker has encoded it before, and otherwise runs `build`
+    and caches its encoded result. A body built while some image's variants
+    were still pending is served uncached and without an ETag, so neither
+    this cache nor clients keep it once the variants exist.
+    """
+    etag = await content_etag(db, table)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        # Answer with the tag the client's copy was served under: the
+        # encoded one when its body was compressed for this encoding.
+        if encoding and encoded_etag(etag, encoding) in if_none_match:
+            headers["ETag"] = encoded_etag(etag, encoding)
+        return Response(status_code=304, headers=headers)
+
+    # Compressed bodies are cached per encoding so hits skip recompression.
+    key = (request.url.path, request.url.query, etag)
+    keys = [(*key, encoding), key] if encoding else [key]
+    cached = response_cache.get(*keys)
+    if cached is None:
+        token = derivatives_pending.set(False)
+        try:
+            body = encode_json(await build())
+            incomplete = derivatives_pending.get()
+        finally:
+            derivatives_pending.reset(token)
+        if incomplete:
+            return Response(
+                content=body,
+                media_type="application/json",
+                headers={"Cache-Control": "no-store", "Vary": "Accept-Encoding"},
+            )
+        cached = (body, None)
+        response_cache.set(table, key, body)
+    if encoding and cached[1] is None and len(cached[0]) >= COMPRESSION_MIN_SIZE:
+        cached = (await run_in_threadpool(compress_body, cached[0], encoding), encoding)
+        response_cache.set(table, (*key, encoding), *cached)
+
+    body, body_encoding = cached
+    if body_encoding:
+        headers["Content-Encoding"] = body_encoding
+        headers["ETag"] = encoded_etag(etag, body_encoding)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def merged_images(image_url: Optional[str], image_urls: Optional[List[str]]) -> List[str]:
+    images = image_urls or []
+    if image_url and image_url not in images:
+        images = [image_url, *images]
+    return images
+
+
+# Columns the summary views need; the rest (body) is never fetched.
+EVENT_SUMMARY_COLUMNS = load_only(
+    Event.id,
+    Event.name,
+    Event.event_date,
+    Event.location,
+    Event.link,
+    Event.description,
+    Event.image_url,
+    Event.image_urls,
+    Event.created_at,
+)
+NEWS_SUMMARY_COLUMNS = load_only(
+    News.id,
+    News.title,
+    News.description,
+    News.image_url,
+    News.image_urls,
+    News.created_at,
+)
+BLOG_SUMMARY_COLUMNS = load_only(
+    Blog.id,
+    Blog.title,
+    Blog.excerpt,
+    Blog.author,
+    Blog.image_url,
+    Blog.created_at,
+)
+
+
+# Serializers build the *Out shapes as plain dicts straight from ORM rows.
+# Column types already guarantee the shapes, so validating each row through
+# Pydantic (and again through response_model) only cost time; the models
+# stay as the documented response schemas.
+def serialize_project(project: Project) -> Dict[str, Any]:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "logo_url": project.logo_url,
+        "link": project.link,
+        "created_at": project.created_at,
+    }
+
+
+def serialize_event(event: Event) -> Dict[str, Any]:
+    images = merged_images(event.image_url, event.image_urls)
+
+    return {
+        "id": event.id,
+        "name": event.name,
+        "event_date": event.event_date,
+        "location": event.location,
+        "link": event.link,
+        "description": event.description,
+        "body": event.body,
+        "image_url": event.image_url,
+        "images": images,
+        "image_variants": image_variants(images),
+        "created_at": event.created_at,
+    }
+
+
+def serialize_news(news_item: News) -> Dict[str, Any]:
+    images = merged_images(news_item.image_url, news_item.image_urls)
+
+    return {
+        "id": news_item.id,
+        "title": news_item.title,
+        "description": news_item.description,
+        "body": news_item.body,
+        "image_url": news_item.image_url,
+        "images": images,
+        "image_variants": image_variants(images),
+        "created_at": news_item.created_at,
+    }
+
+
+def serialize_blog(blog: Blog) -> Dict[str, Any]:
+    return {
+        "id": blog.id,
+        "title": blog.title,
+        "excerpt": blog.excerpt,
+        "author": blog.author,
+        "body": blog.body,
+        "image_url": blog.image_url,
+        "created_at": blog.created_at,
+    }
+
 
-    if not isinstance(data, list):
-        return []
+def serialize_event_summary(event: Event) -> Dict[str, Any]:
+    images = merged_images(event.image_url, event.image_urls)
 
-    cleaned = []
-    for item in data:
-        if isinstance(item, str):
-            url = item.strip()
-            if url:
-                cleaned.append(url)
-    return cleaned
+    return {
+        "id": event.id,
+        "name": event.name,
+        "event_date": event.event_date,
+        "location": event.location,
+        "link": event.link,
+        "description": event.description,
+        "image_url": event.image_url,
+        "images": images,
+        "image_variants": image_variants(images),
+        "created_at": event.created_at,
+    }
 
 
-def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        return None
+def serialize_news_summary(news_item: News) -> Dict[str, Any]:
+    images = merged_images(news_item.image_url, news_item.image_urls)
 
+    return {
+        "id": news_item.id,
+        "title": news_item.title,
+        "description": news_item.description,
+        "image_url": news_item.image_url,
+        "images": images,
+        "image_variants": image_variants(images),
+        "created_at": news_item.created_at,
+    }
 
-def serialize_event(event: Event) -> EventOut:
-    images = parse_image_list(event.image_urls)
-    if event.image_url and event.image_url not in images:
-        images = [event.image_url, *images]
-
-    return EventOut(
-        id=event.id,
-        name=event.name,
-        event_date=event.event_date,
-        location=event.location,
-        link=event.link,
-        description=event.description,
-        body=event.body,
-        image_url=event.image_url,
-        images=images,
-        created_at=event.created_at,
-    )
 
+def serialize_blog_summary(blog: Blog) -> Dict[str, Any]:
+    return {
+        "id": blog.id,
+        "title": blog.title,
+        "excerpt": blog.excerpt,
+        "author": blog.author,
+        "image_url": blog.image_url,
+        "created_at": blog.created_at,
+    }
 
-def serialize_news(news_item: News) -> NewsOut:
-    images = parse_image_list(news_item.image_urls)
-    if news_item.image_url and news_item.image_url not in images:
-        images = [news_item.image_url, *images]
 
-    return NewsOut(
-        id=news_item.id,
-        title=news_item.title,
-        description=news_item.description,
-        body=news_item.body,
-        image_url=news_item.image_url,
-        images=images,
-        created_at=news_item.created_at,
-    )
+def serialize_join_request(join_request: JoinRequest) -> Dict[str, Any]:
+    return {
+        "id": join_request.id,
+        "full_name": join_request.full_name,
+        "email": join_request.email,
+        "phone": join_request.phone,
+        "country": join_request.country,
+        "company": join_request.company,
+        "created_at": join_request.created_at,
+    }
 
 
 # Projects
-@app.get("/api/projects", response_model=List[ProjectOut])
-def get_projects(db: Session = Depends(get_db)):
-    projects = db.query(Project).order_by(Project.created_at.desc()).all()
-    return projects
+@app.get("/api/projects", response_model=Union[List[ProjectOut], Page[ProjectOut]])
+async def get_projects(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    async def build():
+        return await list_response(
+            db,
+            select(Project),
+            Project,
+            serialize_project,
+            limit,
+            cursor,
+        )
+
+    return await cached_json(request, db, "projects", build)
 
 
 @app.post("/api/projects")
-def create_project(
+async def create_project(
     name: str = Form(...),
     logo_url: Optional[str] = Form(None),
     link: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     project = Project(name=name.strip(), logo_url=logo_url, link=link)
     db.add(project)
-    db.commit()
-    db.refresh(project)
-    return {"success": True, "project": ProjectOut.model_validate(project)}
+    await bump_content_version(db, "projects")
+    await db.commit()
+    await db.refresh(project)
+    return json_response({"success": True, "project": serialize_project(project)})
 
 
 @app.put("/api/projects")
-def update_project(
+async def update_project(
     id: int = Form(...),
     name: Optional[str] = Form(None),
     logo_url: Optional[str] = Form(None),
     link: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
-    project = db.query(Project).filter(Project.id == id).first()
+    project = await db.get(Project, id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -728,35 +3077,69 @@ def update_project(
     if link is not None:
         project.link = clean_optional_text(link)
 
-    db.commit()
-    db.refresh(project)
-    return {"success": True, "project": ProjectOut.model_validate(project)}
+    await bump_content_version(db, "projects")
+    await db.commit()
+    await db.refresh(project)
+    return json_response({"success": True, "project": serialize_project(project)})
 
 
 @app.delete("/api/projects")
-def delete_project(
+async def delete_project(
     id: Optional[int] = Form(None),
     id_query: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     project_id = form_or_query_id(id, id_query)
-    deleted = db.query(Project).filter(Project.id == project_id).delete()
-    db.commit()
+    result = await db.execute(delete(Project).where(Project.id == project_id))
+    deleted = result.rowcount
+    if deleted:
+        await bump_content_version(db, "projects")
+    await db.commit()
     if deleted == 0:
         raise HTTPException(status_code=404, detail="Project not found")
     return {"success": True}
 
 
 # Events
-@app.get("/api/events", response_model=List[EventOut])
-def get_events(db: Session = Depends(get_db)):
-    events = db.query(Event).order_by(Event.created_at.desc()).all()
-    return [serialize_event(event) for event in events]
+@app.get(
+    "/api/events",
+    response_model=Union[
+        List[EventOut], Page[EventOut], List[EventSummaryOut], Page[EventSummaryOut]
+    ],
+)
+async def get_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_db),
+):
+    async def build():
+        if view == "summary":
+            query = select(Event).options(EVENT_SUMMARY_COLUMNS)
+            return await list_response(
+                db,
+                query,
+                Event,
+                serialize_event_summary,
+                limit,
+                cursor,
+            )
+        return await list_response(
+            db,
+            select(Event),
+            Event,
+            serialize_event,
+            limit,
+            cursor,
+        )
+
+    return await cached_json(request, db, "events", build)
 
 
 @app.post("/api/events")
-def create_event(
+async def create_event(
     name: str = Form(...),
     event_date: Optional[str] = Form(None),
     location: Optional[str] = Form(None),
@@ -765,7 +3148,7 @@ def create_event(
     body: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
     image_urls: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     event_date_value = None
@@ -786,7 +3169,6 @@ def create_event(
             detail=f"Up to {MAX_EVENT_IMAGES} images are allowed per event",
         )
 
-    images_json = json.dumps(images) if images else None
     primary_image = cleaned_image_url or (images[0] if images else None)
     cleaned_body = clean_optional_text(body)
 
@@ -798,16 +3180,17 @@ def create_event(
         description=description.strip() if description else None,
         body=cleaned_body,
         image_url=primary_image,
-        image_urls=images_json,
+        image_urls=images,
     )
     db.add(event)
-    db.commit()
-    db.refresh(event)
-    return {"success": True, "event": serialize_event(event)}
+    await bump_content_version(db, "events")
+    await db.commit()
+    await db.refresh(event)
+    return json_response({"success": True, "event": serialize_event(event)})
 
 
 @app.put("/api/events")
-def update_event(
+async def update_event(
     id: int = Form(...),
     name: Optional[str] = Form(None),
     event_date: Optional[str] = Form(None),
@@ -817,10 +3200,10 @@ def update_event(
     body: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
     image_urls: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
-    event = db.query(Event).filter(Event.id == id).first()
+    event = await db.get(Event, id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
@@ -854,7 +3237,7 @@ def update_event(
         event.body = clean_optional_text(body)
 
     if image_urls is not None or image_url is not None:
-        existing_images = parse_image_list(event.image_urls)
+        existing_images = list(event.image_urls or [])
         cleaned_primary = clean_optional_text(image_url)
 
         if image_urls is not None:
@@ -871,52 +3254,91 @@ def update_event(
                 detail=f"Up to {MAX_EVENT_IMAGES} images are allowed per event",
             )
 
-        event.image_urls = json.dumps(images) if images else None
+        event.image_urls = images
         event.image_url = cleaned_primary or (images[0] if images else None)
 
-    db.commit()
-    db.refresh(event)
-    return {"success": True, "event": serialize_event(event)}
+    await bump_content_version(db, "events")
+    await db.commit()
+    await db.refresh(event)
+    return json_response({"success": True, "event": serialize_event(event)})
 
 
 @app.delete("/api/events")
-def delete_event(
+async def delete_event(
     id: Optional[int] = Form(None),
     id_query: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     event_id = form_or_query_id(id, id_query)
-    deleted = db.query(Event).filter(Event.id == event_id).delete()
-    db.commit()
+    result = await db.execute(delete(Event).where(Event.id == event_id))
+    deleted = result.rowcount
+    if deleted:
+        await bump_content_version(db, "events")
+    await db.commit()
     if deleted == 0:
         raise HTTPException(status_code=404, detail="Event not found")
     return {"success": True}
 
 
 # News
-@app.get("/api/news", response_model=List[NewsOut])
-def get_news(db: Session = Depends(get_db)):
-    news_items = db.query(News).order_by(News.created_at.desc()).all()
-    return [serialize_news(item) for item in news_items]
+@app.get(
+    "/api/news",
+    response_model=Union[
+        List[NewsOut], Page[NewsOut], List[NewsSummaryOut], Page[NewsSummaryOut]
+    ],
+)
+async def get_news(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_db),
+):
+    async def build():
+        if view == "summary":
+            query = select(News).options(NEWS_SUMMARY_COLUMNS)
+            return await list_response(
+                db,
+                query,
+                News,
+                serialize_news_summary,
+                limit,
+                cursor,
+            )
+        return await list_response(
+            db,
+            select(News),
+            News,
+            serialize_news,
+            limit,
+            cursor,
+        )
+
+    return await cached_json(request, db, "news", build)
 
 
 @app.get("/api/news/{news_id}", response_model=NewsOut)
-def get_news_item(news_id: int, db: Session = Depends(get_db)):
-    news_item = db.query(News).filter(News.id == news_id).first()
-    if not news_item:
-        raise HTTPException(status_code=404, detail="News not found")
-    return serialize_news(news_item)
+async def get_news_item(
+    news_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
+    async def build():
+        news_item = await db.get(News, news_id)
+        if not news_item:
+            raise HTTPException(status_code=404, detail="News not found")
+        return serialize_news(news_item)
+
+    return await cached_json(request, db, "news", build)
 
 
 @app.post("/api/news")
-def create_news(
+async def create_news(
     title: str = Form(...),
     description: str = Form(...),
     body: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
     image_urls: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     cleaned_image_url = clean_optional_text(image_url)
@@ -930,7 +3352,6 @@ def create_news(
             detail=f"Up to {MAX_NEWS_IMAGES} images are allowed per news item",
     )
 
-    images_json = json.dumps(images) if images else None
     primary_image = cleaned_image_url or (images[0] if images else None)
     cleaned_body = clean_optional_text(body)
 
@@ -939,26 +3360,27 @@ def create_news(
         description=description.strip(),
         body=cleaned_body,
         image_url=primary_image,
-        image_urls=images_json,
+        image_urls=images,
     )
     db.add(news_item)
-    db.commit()
-    db.refresh(news_item)
-    return {"success": True, "news": serialize_news(news_item)}
+    await bump_content_version(db, "news")
+    await db.commit()
+    await db.refresh(news_item)
+    return json_response({"success": True, "news": serialize_news(news_item)})
 
 
 @app.put("/api/news")
-def update_news(
+async def update_news(
     id: int = Form(...),
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     body: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
     image_urls: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
-    news_item = db.query(News).filter(News.id == id).first()
+    news_item = await db.get(News, id)
     if not news_item:
         raise HTTPException(status_code=404, detail="News not found")
 
@@ -978,7 +3400,7 @@ def update_news(
         news_item.body = clean_optional_text(body)
 
     if image_urls is not None or image_url is not None:
-        existing_images = parse_image_list(news_item.image_urls)
+        existing_images = list(news_item.image_urls or [])
         cleaned_primary = clean_optional_text(image_url)
 
         if image_urls is not None:
@@ -995,52 +3417,91 @@ def update_news(
                 detail=f"Up to {MAX_NEWS_IMAGES} images are allowed per news item",
             )
 
-        news_item.image_urls = json.dumps(images) if images else None
+        news_item.image_urls = images
         news_item.image_url = cleaned_primary or (images[0] if images else None)
 
-    db.commit()
-    db.refresh(news_item)
-    return {"success": True, "news": serialize_news(news_item)}
+    await bump_content_version(db, "news")
+    await db.commit()
+    await db.refresh(news_item)
+    return json_response({"success": True, "news": serialize_news(news_item)})
 
 
 @app.delete("/api/news")
-def delete_news(
+async def delete_news(
     id: Optional[int] = Form(None),
     id_query: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     news_id = form_or_query_id(id, id_query)
-    deleted = db.query(News).filter(News.id == news_id).delete()
-    db.commit()
+    result = await db.execute(delete(News).where(News.id == news_id))
+    deleted = result.rowcount
+    if deleted:
+        await bump_content_version(db, "news")
+    await db.commit()
     if deleted == 0:
         raise HTTPException(status_code=404, detail="News not found")
     return {"success": True}
 
 
 # Blogs
-@app.get("/api/blogs", response_model=List[BlogOut])
-def get_blogs(db: Session = Depends(get_db)):
-    blogs = db.query(Blog).order_by(Blog.created_at.desc()).all()
-    return blogs
+@app.get(
+    "/api/blogs",
+    response_model=Union[
+        List[BlogOut], Page[BlogOut], List[BlogSummaryOut], Page[BlogSummaryOut]
+    ],
+)
+async def get_blogs(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_db),
+):
+    async def build():
+        if view == "summary":
+            query = select(Blog).options(BLOG_SUMMARY_COLUMNS)
+            return await list_response(
+                db,
+                query,
+                Blog,
+                serialize_blog_summary,
+                limit,
+                cursor,
+            )
+        return await list_response(
+            db,
+            select(Blog),
+            Blog,
+            serialize_blog,
+            limit,
+            cursor,
+        )
+
+    return await cached_json(request, db, "blogs", build)
 
 
 @app.get("/api/blogs/{blog_id}", response_model=BlogOut)
-def get_blog(blog_id: int, db: Session = Depends(get_db)):
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
-    if not blog:
-        raise HTTPException(status_code=404, detail="Blog not found")
-    return BlogOut.model_validate(blog)
+async def get_blog(
+    blog_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
+    async def build():
+        blog = await db.get(Blog, blog_id)
+        if not blog:
+            raise HTTPException(status_code=404, detail="Blog not found")
+        return serialize_blog(blog)
+
+    return await cached_json(request, db, "blogs", build)
 
 
 @app.post("/api/blogs")
-def create_blog(
+async def create_blog(
     title: str = Form(...),
     excerpt: str = Form(...),
     author: str = Form(...),
     body: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     body_cleaned = clean_optional_text(body)
@@ -1052,23 +3513,24 @@ def create_blog(
         image_url=image_url,
     )
     db.add(blog)
-    db.commit()
-    db.refresh(blog)
-    return {"success": True, "blog": BlogOut.model_validate(blog)}
+    await bump_content_version(db, "blogs")
+    await db.commit()
+    await db.refresh(blog)
+    return json_response({"success": True, "blog": serialize_blog(blog)})
 
 
 @app.put("/api/blogs")
-def update_blog(
+async def update_blog(
     id: int = Form(...),
     title: Optional[str] = Form(None),
     excerpt: Optional[str] = Form(None),
     author: Optional[str] = Form(None),
     body: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
-    blog = db.query(Blog).filter(Blog.id == id).first()
+    blog = await db.get(Blog, id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
@@ -1096,309 +3558,794 @@ def update_blog(
     if image_url is not None:
         blog.image_url = clean_optional_text(image_url)
 
-    db.commit()
-    db.refresh(blog)
-    return {"success": True, "blog": BlogOut.model_validate(blog)}
+    await bump_content_version(db, "blogs")
+    await db.commit()
+    await db.refresh(blog)
+    return json_response({"success": True, "blog": serialize_blog(blog)})
 
 
 @app.delete("/api/blogs")
-def delete_blog(
+async def delete_blog(
     id: Optional[int] = Form(None),
     id_query: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
     blog_id = form_or_query_id(id, id_query)
-    deleted = db.query(Blog).filter(Blog.id == blog_id).delete()
-    db.commit()
+    result = await db.execute(delete(Blog).where(Blog.id == blog_id))
+    deleted = result.rowcount
+    if deleted:
+        await bump_content_version(db, "blogs")
+    await db.commit()
     if deleted == 0:
         raise HTTPException(status_code=404, detail="Blog not found")
     return {"success": True}
 
 
-def _export_backup_payload(db: Session) -> BytesIO:
-    buffer = BytesIO()
-    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        projects = db.query(Project).order_by(Project.id.asc()).all()
-        events = db.query(Event).order_by(Event.id.asc()).all()
-        news_items = db.query(News).order_by(News.id.asc()).all()
-        blogs = db.query(Blog).order_by(Blog.id.asc()).all()
-
-        archive.writestr(
-            "projects.json",
-            json.dumps(
-                [
-                    {
-                        "id": project.id,
-                        "name": project.name,
-                        "logo_url": project.logo_url,
-                        "link": project.link,
-                        "created_at": project.created_at.isoformat()
-                        if project.created_at
-                        else None,
-                    }
-                    for project in projects
-                ],
-                indent=2,
-            ),
+# Search
+# ts_headline marks matches with private-use sentinels; the snippet is
+# HTML-escaped before they become <mark> tags (see highlight_snippet).
+SEARCH_MARK_START, SEARCH_MARK_STOP = "\ue000", "\ue001"
+SEARCH_HEADLINE_OPTIONS = (
+    f'StartSel="{SEARCH_MARK_START}", StopSel="{SEARCH_MARK_STOP}", '
+    "MaxWords=35, MinWords=15"
+)
+# A tag starts with a letter, / or !; quoted attribute values may contain ">".
+HTML_TAG_PATTERN = r"""</?[A-Za-z!][^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>"""
+# (type, model, title column, columns the snippet is cut from)
+SEARCH_SOURCES = (
+    ("events", Event, Event.name, (Event.location, Event.description, Event.body)),
+    ("news", News, News.title, (News.description, News.body)),
+    ("blogs", Blog, Blog.title, (Blog.excerpt, Blog.body)),
+)
+
+
+def encode_search_cursor(rank: float, kind: str, row_id: int) -> str:
+    raw = json.dumps([rank, kind, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, kind, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), str(kind), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def search_snippet(model, columns, query, row_id):
+    """ts_headline over the row's text with rich-text markup stripped."""
+    document = func.concat_ws(" ", *columns)
+    plain = func.regexp_replace(document, HTML_TAG_PATTERN, " ", "g")
+    return (
+        select(func.ts_headline(SEARCH_CONFIG, plain, query, SEARCH_HEADLINE_OPTIONS))
+        .where(model.id == row_id)
+        .scalar_subquery()
+    )
+
+
+def highlight_snippet(headline: Optional[str]) -> str:
+    """Escape a ts_headline result as HTML, keeping only its <mark> tags."""
+    if not headline:
+        return ""
+    # Stripping tags leaves entities such as &amp; behind; decode them first
+    # so they are not escaped twice.
+    text = html.escape(html.unescape(headline), quote=False)
+    return text.replace(SEARCH_MARK_START, "<mark>").replace(SEARCH_MARK_STOP, "</mark>")
+
+
+@app.get("/api/search", response_model=Page[SearchHitOut])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(
+        None, description="Comma-separated subset of events,news,blogs"
+    ),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ranked full-text search over events, news and blogs, using each table's
+    generated search_vector and its GIN index. `q` takes web-search syntax
+    ("quoted phrases", or, -exclude). Hits come best first, with a
+    <mark>-highlighted snippet; pass next_cursor back for the next page.
+    """
+    wanted = {item.strip() for item in types.split(",")} if types else None
+    sources = [source for source in SEARCH_SOURCES if not wanted or source[0] in wanted]
+    if not sources:
+        raise HTTPException(
+            status_code=400, detail="types must list events, news and/or blogs"
         )
 
-        archive.writestr(
-            "events.json",
-            json.dumps(
-                [
-                    {
-                        "id": event.id,
-                        "name": event.name,
-                        "event_date": event.event_date.isoformat()
-                        if event.event_date
-                        else None,
-                        "location": event.location,
-                        "link": event.link,
-                        "description": event.description,
-                        "body": event.body,
-                        "image_url": event.image_url,
-                        "image_urls": parse_image_list(event.image_urls),
-                        "created_at": event.created_at.isoformat()
-                        if event.created_at
-                        else None,
-                    }
-                    for event in events
-                ],
-                indent=2,
-            ),
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    branches = [
+        select(
+            literal_column(f"'{kind}'", Text).label("type"),
+            model.id.label("id"),
+            title.label("title"),
+            model.image_url.label("image_url"),
+            # float8, so the rank in a cursor compares equal to the stored one.
+            func.ts_rank_cd(model.search_vector, query)
+            .cast(DOUBLE_PRECISION)
+            .label("rank"),
+            model.created_at.label("created_at"),
+        ).where(model.search_vector.op("@@")(query))
+        for kind, model, title, _ in sources
+    ]
+    hits = union_all(*branches).subquery("hits")
+    # Everything descends, so the (rank, type, id) keyset is one row comparison.
+    page = select(hits)
+    if cursor:
+        page = page.where(
+            tuple_(hits.c.rank, hits.c.type, hits.c.id)
+            < tuple_(*decode_search_cursor(cursor))
+        )
+    page = (
+        page.order_by(hits.c.rank.desc(), hits.c.type.desc(), hits.c.id.desc())
+        .limit(limit + 1)
+        .subquery("page")
+    )
+    # Snippets are only cut for the rows on this page.
+    snippet = case(
+        *[
+            (page.c.type == kind, search_snippet(model, columns, query, page.c.id))
+            for kind, model, _, columns in sources
+        ]
+    )
+    result = await db.execute(
+        select(page, snippet.label("snippet")).order_by(
+            page.c.rank.desc(), page.c.type.desc(), page.c.id.desc()
         )
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_search_cursor(last.rank, last.type, last.id)
+    items = [
+        {
+            "type": row.type,
+            "id": row.id,
+            "title": row.title,
+            "snippet": highlight_snippet(row.snippet),
+            "image_url": row.image_url,
+            "rank": row.rank,
+            "created_at": row.created_at,
+        }
+        for row in rows
+    ]
+    return json_response({"items": items, "next_cursor": next_cursor})
 
-        archive.writestr(
-            "news.json",
-            json.dumps(
-                [
-                    {
-                        "id": news_item.id,
-                        "title": news_item.title,
-                        "description": news_item.description,
-                        "body": news_item.body,
-                        "image_url": news_item.image_url,
-                        "image_urls": parse_image_list(news_item.image_urls),
-                        "created_at": news_item.created_at.isoformat()
-                        if news_item.created_at
-                        else None,
-                    }
-                    for news_item in news_items
-                ],
-                indent=2,
-            ),
+
+def _project_backup_row(project: Project) -> Dict[str, Any]:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "logo_url": project.logo_url,
+        "link": project.link,
+        "created_at": project.created_at.isoformat() if project.created_at else None,
+    }
+
+
+def _event_backup_row(event: Event) -> Dict[str, Any]:
+    return {
+        "id": event.id,
+        "name": event.name,
+        "event_date": event.event_date.isoformat() if event.event_date else None,
+        "location": event.location,
+        "link": event.link,
+        "description": event.description,
+        "body": event.body,
+        "image_url": event.image_url,
+        "image_urls": list(event.image_urls or []),
+        "created_at": event.created_at.isoformat() if event.created_at else None,
+    }
+
+
+def _news_backup_row(news_item: News) -> Dict[str, Any]:
+    return {
+        "id": news_item.id,
+        "title": news_item.title,
+        "description": news_item.description,
+        "body": news_item.body,
+        "image_url": news_item.image_url,
+        "image_urls": list(news_item.image_urls or []),
+        "created_at": news_item.created_at.isoformat()
+        if news_item.created_at
+        else None,
+    }
+
+
+def _blog_backup_row(blog: Blog) -> Dict[str, Any]:
+    return {
+        "id": blog.id,
+        "title": blog.title,
+        "excerpt": blog.excerpt,
+        "author": blog.author,
+        "body": blog.body,
+        "image_url": blog.image_url,
+        "created_at": blog.created_at.isoformat() if blog.created_at else None,
+    }
+
+
+def _backup_images(item: Dict[str, Any]) -> Tuple[Optional[str], List[str]]:
+    images = item.get("image_urls") or []
+    primary = clean_optional_text(item.get("image_url"))
+    if primary and primary not in images:
+        images.insert(0, primary)
+    return primary or (images[0] if images else None), images
+
+
+def _project_from_backup(item: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(
+        id=item.get("id"),
+        name=item.get("name", "").strip(),
+        logo_url=clean_optional_text(item.get("logo_url")),
+        link=clean_optional_text(item.get("link")),
+        created_at=parse_iso_datetime(item.get("created_at")),
+    )
+
+
+def _event_from_backup(item: Dict[str, Any]) -> Dict[str, Any]:
+    primary, images = _backup_images(item)
+    return dict(
+        id=item.get("id"),
+        name=item.get("name", "").strip(),
+        event_date=date.fromisoformat(item["event_date"])
+        if item.get("event_date")
+        else None,
+        location=clean_optional_text(item.get("location")),
+        link=clean_optional_text(item.get("link")),
+        description=clean_optional_text(item.get("description")),
+        body=clean_optional_text(item.get("body")),
+        image_url=primary,
+        image_urls=images,
+        created_at=parse_iso_datetime(item.get("created_at")),
+    )
+
+
+def _news_from_backup(item: Dict[str, Any]) -> Dict[str, Any]:
+    primary, images = _backup_images(item)
+    return dict(
+        id=item.get("id"),
+        title=item.get("title", "").strip(),
+        description=item.get("description", "").strip(),
+        body=clean_optional_text(item.get("body")),
+        image_url=primary,
+        image_urls=images,
+        created_at=parse_iso_datetime(item.get("created_at")),
+    )
+
+
+def _blog_from_backup(item: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(
+        id=item.get("id"),
+        title=item.get("title", "").strip(),
+        excerpt=item.get("excerpt", "").strip(),
+        author=item.get("author", "").strip(),
+        body=clean_optional_text(item.get("body")),
+        image_url=clean_optional_text(item.get("image_url")),
+        created_at=parse_iso_datetime(item.get("created_at")),
+    )
+
+
+# (archive member, model, export row builder, restore row builder). Restore
+# builders return plain column dicts for COPY, bypassing the ORM.
+BACKUP_TABLES = (
+    ("projects.json", Project, _project_backup_row, _project_from_backup),
+    ("events.json", Event, _event_backup_row, _event_from_backup),
+    ("news.json", News, _news_backup_row, _news_from_backup),
+    ("blogs.json", Blog, _blog_backup_row, _blog_from_backup),
+)
+BACKUP_FORMAT_VERSION = 1
+BACKUP_MANIFEST_NAME = "manifest.json"
+BACKUP_SINCE_MARGIN = timedelta(minutes=5)
+BACKUP_YIELD_PER = 500
+BACKUP_COPY_BATCH_SIZE = 2000
+BACKUP_CHUNK_SIZE = 1024 * 1024
+# Already-compressed media gain nothing from DEFLATE; store them as-is.
+STORED_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".zip", ".gz"}
+
+
+class _ZipStreamSink:
+    """
+    Write-only, unseekable file object for zipfile. Whatever the archive
+    writes is buffered until drained and handed to the streaming response.
+    zipfile sees no seek() and falls back to data descriptors, so entries
+    never need rewriting.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _copy_file_chunk(source, entry, hasher) -> bool:
+    chunk = source.read(BACKUP_CHUNK_SIZE)
+    if chunk:
+        hasher.update(chunk)
+        entry.write(chunk)
+    return bool(chunk)
+
+
+async def _stream_backup_archive(
+    backup_id: str, base: Optional[BackupManifest]
+) -> AsyncGenerator[bytes, None]:
+    """
+    Yield the backup zip piece by piece: table rows are streamed from a
+    server-side cursor and upload files are copied in fixed-size chunks, so
+    memory stays flat regardless of archive size.
+
+    With a `base`, only rows changed since that backup and uploads whose
+    size, mtime and hash differ from its manifest are included. The full id
+    list of each table is still recorded so restore can apply deletions.
+    """
+    sink = _ZipStreamSink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+    manifest: Dict[str, Any] = {
+        "format": BACKUP_FORMAT_VERSION,
+        "backup_id": backup_id,
+        "kind": "incremental" if base else "full",
+        "base_id": base.backup_id if base else None,
+    }
+
+    async with AsyncSessionLocal() as db:
+        # One snapshot for every table and the id lists below, so a row
+        # deleted mid-export can't be exported yet missing from "ids".
+        await db.connection(
+            execution_options={"isolation_level": "REPEATABLE READ"}
+        )
+        snapshot_at = await db.scalar(select(func.now()))
+        manifest["created_at"] = snapshot_at.isoformat()
+        # Margin for writes whose transaction started before the base
+        # snapshot but committed after it; replayed rows are simply upserted.
+        since = base.created_at - BACKUP_SINCE_MARGIN if base else None
+
+        for name, model, to_row, _ in BACKUP_TABLES:
+            stmt = select(model).order_by(model.id.asc())
+            if since is not None:
+                stmt = stmt.where(
+                    or_(model.updated_at.is_(None), model.updated_at > since)
+                )
+            with archive.open(name, "w", force_zip64=True) as entry:
+                entry.write(b"[")
+                first = True
+                result = await db.stream_scalars(
+                    stmt.execution_options(yield_per=BACKUP_YIELD_PER)
+                )
+                async for rows in result.partitions():
+                    encoded = ",\n".join(
+                        json.dumps(to_row(row), indent=2) for row in rows
+                    )
+                    prefix = "\n" if first else ",\n"
+                    first = False
+                    await run_in_threadpool(entry.write, (prefix + encoded).encode())
+                    yield sink.drain()
+                entry.write(b"\n]")
+            yield sink.drain()
+
+        if base:
+            manifest["ids"] = {
+                model.__tablename__: list(
+                    await db.scalars(select(model.id).order_by(model.id.asc()))
+                )
+                for _, model, _, _ in BACKUP_TABLES
+            }
+
+    # Bundle uploaded assets (best-effort)
+    previous_uploads = json.loads(base.uploads) if base else {}
+    uploads: Dict[str, Dict[str, Any]] = {}
+    for stored in await run_in_threadpool(upload_storage.list):
+        relative = stored.name
+        entry_meta = {"size": stored.size, "mtime_ns": stored.mtime_ns}
+        known = previous_uploads.get(relative)
+        unchanged = known and all(
+            known.get(key) == value for key, value in entry_meta.items()
         )
+        if unchanged:
+            uploads[relative] = known
+            continue
+        if known:
+            # Touched but possibly identical; hashing is cheaper than shipping it.
+            try:
+                digest = await run_in_threadpool(_hash_upload, relative)
+            except OSError:
+                continue
+            if digest == known.get("sha256"):
+                uploads[relative] = {**entry_meta, "sha256": digest}
+                continue
 
-        archive.writestr(
-            "blogs.json",
-            json.dumps(
-                [
-                    {
-                        "id": blog.id,
-                        "title": blog.title,
-                        "excerpt": blog.excerpt,
-                        "author": blog.author,
-                        "body": blog.body,
-                        "image_url": blog.image_url,
-                        "created_at": blog.created_at.isoformat()
-                        if blog.created_at
-                        else None,
-                    }
-                    for blog in blogs
-                ],
-                indent=2,
-            ),
+        try:
+            source = await run_in_threadpool(upload_storage.open, relative)
+        except OSError:
+            continue
+        hasher = hashlib.sha256()
+        try:
+            info = zipfile.ZipInfo(
+                str(Path("uploads") / relative),
+                time.localtime(stored.mtime_ns / 1_000_000_000)[:6],
+            )
+            info.external_attr = 0o644 << 16
+            info.compress_type = (
+                zipfile.ZIP_STORED
+                if Path(relative).suffix.lower() in STORED_SUFFIXES
+                else zipfile.ZIP_DEFLATED
+            )
+            with archive.open(info, "w") as entry:
+                while await run_in_threadpool(
+                    _copy_file_chunk, source, entry, hasher
+                ):
+                    yield sink.drain()
+        finally:
+            source.close()
+        uploads[relative] = {**entry_meta, "sha256": hasher.hexdigest()}
+        yield sink.drain()
+
+    manifest["uploads"] = uploads
+    archive.writestr(BACKUP_MANIFEST_NAME, json.dumps(manifest, indent=2))
+    archive.close()
+    yield sink.drain()
+
+    # Only remember backups that were delivered in full.
+    async with AsyncSessionLocal() as db:
+        db.add(
+            BackupManifest(
+                backup_id=backup_id,
+                base_id=manifest["base_id"],
+                kind=manifest["kind"],
+                created_at=snapshot_at,
+                uploads=json.dumps(uploads),
+            )
         )
+        await db.commit()
+
+
+def _iter_backup_rows(stream: IO[bytes], name: str) -> Iterator[Any]:
+    """
+    Yield the items of a backup table's top-level JSON array one at a time,
+    reading the archive member in chunks instead of loading it whole.
+    """
+    decoder = json.JSONDecoder()
+    reader = io.TextIOWrapper(stream, encoding="utf-8")
+    buffer = ""
+    pos = 0
+    eof = False
+    expect = "["  # then "item_or_end", "item", "sep_or_end"
+
+    def refill() -> None:
+        nonlocal buffer, pos, eof
+        chunk = reader.read(BACKUP_CHUNK_SIZE)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Could not read {name}: unexpected end of data",
+                )
+            refill()
+            continue
+
+        char = buffer[pos]
+        if expect == "[":
+            if char != "[":
+                raise HTTPException(
+                    status_code=400, detail=f"{name} must contain a list"
+                )
+            pos += 1
+            expect = "item_or_end"
+            continue
+        if expect in ("item_or_end", "sep_or_end") and char == "]":
+            return
+        if expect == "sep_or_end":
+            if char != ",":
+                raise HTTPException(
+                    status_code=400, detail=f"Could not read {name}: expected ','"
+                )
+            pos += 1
+            expect = "item"
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise HTTPException(
+                    status_code=400, detail=f"Could not read {name}: {exc}"
+                )
+            refill()
+            continue
+        if end == len(buffer) and not eof:
+            # A bare number could still be cut off mid-chunk; re-read to be sure.
+            refill()
+            continue
+        pos = end
+        expect = "sep_or_end"
+        yield item
+
+
+def _take_rows(rows: Iterator[Any], count: int) -> List[Any]:
+    return list(itertools.islice(rows, count))
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _copy_backup_table(
+    db: AsyncSession,
+    archive: zipfile.ZipFile,
+    name: str,
+    model,
+    from_backup: Callable[[Dict[str, Any]], Dict[str, Any]],
+    replace_existing: bool = False,
+) -> int:
+    """
+    Load one table with COPY FROM STDIN on the session's own connection, so
+    it shares the restore transaction. Rows are parsed and sent in bounded
+    batches; with `replace_existing` (incremental archives) rows already
+    present under the same id are deleted first.
+    """
+    # updated_at is left to its default so restored rows count as changed now;
+    # generated columns (search_vector) are computed by Postgres.
+    columns = [
+        column.name
+        for column in model.__table__.columns
+        if column.name != "updated_at" and column.computed is None
+    ]
+    statement = pg_sql.SQL("COPY {} ({}) FROM STDIN").format(
+        pg_sql.Identifier(model.__tablename__),
+        pg_sql.SQL(", ").join(pg_sql.Identifier(column) for column in columns),
+    )
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
 
-        # Bundle uploaded assets (best-effort)
-        if UPLOAD_DIR.exists():
-            for file_path in UPLOAD_DIR.rglob("*"):
-                if file_path.is_file():
-                    relative = file_path.relative_to(UPLOAD_DIR)
-                    archive.write(
-                        file_path,
-                        arcname=str(Path("uploads") / relative),
+    stream = await run_in_threadpool(archive.open, name)
+    rows = _iter_backup_rows(stream, name)
+    count = 0
+    try:
+        async with raw_connection.driver_connection.cursor() as cursor:
+            while True:
+                batch = await run_in_threadpool(
+                    _take_rows, rows, BACKUP_COPY_BATCH_SIZE
+                )
+                if not batch:
+                    break
+                values = [from_backup(item) for item in batch]
+                if replace_existing:
+                    await db.execute(
+                        delete(model).where(
+                            model.id.in_([row["id"] for row in values])
+                        )
                     )
+                async with cursor.copy(statement) as copy:
+                    for row in values:
+                        await copy.write_row([row.get(column) for column in columns])
+                count += len(batch)
+    finally:
+        stream.close()
+    return count
+
+
+def _read_backup_manifest(archive: zipfile.ZipFile) -> Dict[str, Any]:
+    """Archives from before manifests existed are treated as full backups."""
+    if BACKUP_MANIFEST_NAME not in archive.namelist():
+        return {"kind": "full", "backup_id": None, "base_id": None}
+    try:
+        return json.loads(archive.read(BACKUP_MANIFEST_NAME).decode("utf-8"))
+    except Exception as exc:
+        raise HTTPException(
+            status_code=400, detail=f"Could not read {BACKUP_MANIFEST_NAME}: {exc}"
+        )
 
-    buffer.seek(0)
-    return buffer
+
+def _check_backup_chain(manifests: List[Dict[str, Any]]) -> None:
+    if manifests[0].get("kind") != "full":
+        raise HTTPException(
+            status_code=400, detail="Restore chain must start with a full backup"
+        )
+    for previous, current in zip(manifests, manifests[1:]):
+        if current.get("kind") != "incremental":
+            raise HTTPException(
+                status_code=400,
+                detail="Only incremental backups may follow the first archive",
+            )
+        if not previous.get("backup_id") or current.get("base_id") != previous.get(
+            "backup_id"
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Backup {current.get('backup_id')} is not based on "
+                f"{previous.get('backup_id')}",
+            )
 
 
-def _load_backup_file(file_bytes: bytes) -> dict:
+def _open_backup_archive(source: IO[bytes]) -> zipfile.ZipFile:
     try:
-        archive = zipfile.ZipFile(BytesIO(file_bytes))
+        return zipfile.ZipFile(source)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Invalid backup file: {exc}")
 
-    payload = {}
-    for name in ("projects.json", "events.json", "news.json", "blogs.json"):
-        if name not in archive.namelist():
-            payload[name] = []
-            continue
-        try:
-            data = json.loads(archive.read(name).decode("utf-8"))
-        except Exception as exc:
-            raise HTTPException(status_code=400, detail=f"Could not read {name}: {exc}")
-        if not isinstance(data, list):
-            raise HTTPException(status_code=400, detail=f"{name} must contain a list")
-        payload[name] = data
-    return payload
+
+def _extract_upload_member(archive: zipfile.ZipFile, member: str) -> None:
+    # clean_storage_name rejects absolute and ../ paths (no traversal)
+    name = clean_storage_name(member[len("uploads/") :])
+    if name is None:
+        return
+    with archive.open(member) as f_in:
+        upload_storage.save_stream(name, f_in)
 
 
 @app.get("/api/backup")
-def download_backup(db: Session = Depends(get_db), _: bool = Depends(require_admin)):
-    buffer = _export_backup_payload(db)
-    filename = f"gtn-backup-{int(time.time())}.zip"
-    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return Response(
-        content=buffer.getvalue(), media_type="application/zip", headers=headers
+async def download_backup(
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(require_admin),
+):
+    base = None
+    if since:
+        base = await db.get(BackupManifest, since)
+        if not base:
+            raise HTTPException(status_code=404, detail="Base backup not found")
+
+    backup_id = f"{int(time.time())}-{secrets.token_hex(4)}"
+    kind = "incr" if base else "full"
+    filename = f"gtn-backup-{kind}-{backup_id}.zip"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Backup-Id": backup_id,
+    }
+    return StreamingResponse(
+        _stream_backup_archive(backup_id, base),
+        media_type="application/zip",
+        headers=headers,
     )
 
 
 @app.post("/api/backup/restore")
 async def restore_backup(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    file: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_db),
     _: bool = Depends(require_admin),
 ):
+    """
+    Restore a full backup, optionally followed by the incremental backups
+    taken on top of it (send them in order, all under the `file` field).
+    """
     if not file:
         raise HTTPException(status_code=400, detail="Backup file is required")
 
-    content = await file.read()
-    payload = _load_backup_file(content)
-    archive = zipfile.ZipFile(BytesIO(content))
+    # Starlette has already spooled the multipart body to temporary files;
+    # read the archives straight from them rather than pulling them into memory.
+    archives: List[zipfile.ZipFile] = []
+    restored_counts: Dict[str, int] = {}
+    timings_ms: Dict[str, float] = {}
 
     try:
-        db.query(Project).delete()
-        db.query(Event).delete()
-        db.query(News).delete()
-        db.query(Blog).delete()
-
-        project_rows = []
-        for item in payload.get("projects.json", []):
-            project_rows.append(
-                Project(
-                    id=item.get("id"),
-                    name=item.get("name", "").strip(),
-                    logo_url=clean_optional_text(item.get("logo_url")),
-                    link=clean_optional_text(item.get("link")),
-                    created_at=parse_iso_datetime(item.get("created_at")),
-                )
-            )
-
-        event_rows = []
-        for item in payload.get("events.json", []):
-            images = item.get("image_urls") or []
-            primary = clean_optional_text(item.get("image_url"))
-            if primary and primary not in images:
-                images.insert(0, primary)
-            event_rows.append(
-                Event(
-                    id=item.get("id"),
-                    name=item.get("name", "").strip(),
-                    event_date=date.fromisoformat(item["event_date"])
-                    if item.get("event_date")
-                    else None,
-                    location=clean_optional_text(item.get("location")),
-                    link=clean_optional_text(item.get("link")),
-                    description=clean_optional_text(item.get("description")),
-                    body=clean_optional_text(item.get("body")),
-                    image_url=primary or (images[0] if images else None),
-                    image_urls=json.dumps(images) if images else None,
-                    created_at=parse_iso_datetime(item.get("created_at")),
-                )
-            )
-
-        news_rows = []
-        for item in payload.get("news.json", []):
-            images = item.get("image_urls") or []
-            primary = clean_optional_text(item.get("image_url"))
-            if primary and primary not in images:
-                images.insert(0, primary)
-            news_rows.append(
-                News(
-                    id=item.get("id"),
-                    title=item.get("title", "").strip(),
-                    description=item.get("description", "").strip(),
-                    body=clean_optional_text(item.get("body")),
-                    image_url=primary or (images[0] if images else None),
-                    image_urls=json.dumps(images) if images else None,
-                    created_at=parse_iso_datetime(item.get("created_at")),
+        for upload in file:
+            archives.append(await run_in_threadpool(_open_backup_archive, upload.file))
+        manifests = [
+            await run_in_threadpool(_read_backup_manifest, archive)
+            for archive in archives
+        ]
+        _check_backup_chain(manifests)
+
+        for index, (archive, manifest) in enumerate(zip(archives, manifests)):
+            incremental = index > 0
+            if not incremental:
+                await db.execute(delete(Project))
+                await db.execute(delete(Event))
+                await db.execute(delete(News))
+                await db.execute(delete(Blog))
+
+            names = set(archive.namelist())
+            for name, model, _, from_backup in BACKUP_TABLES:
+                table = model.__tablename__
+                started = time.perf_counter()
+                if incremental:
+                    # Rows deleted since the base backup. The ids go as one
+                    # array parameter: NOT IN would bind one per row and hit
+                    # Postgres' 65535-parameter limit on large tables.
+                    kept = bindparam(
+                        "kept_ids",
+                        manifest.get("ids", {}).get(table, []),
+                        type_=ARRAY(BigInteger),
+                    )
+                    await db.execute(delete(model).where(model.id != all_(kept)))
+                count = 0
+                if name in names:
+                    count = await _copy_backup_table(
+                        db, archive, name, model, from_backup, incremental
+                    )
+                restored_counts[table] = restored_counts.get(table, 0) + count
+                timings_ms[table] = round(
+                    timings_ms.get(table, 0) + _elapsed_ms(started), 1
                 )
-            )
 
-        blog_rows = []
-        for item in payload.get("blogs.json", []):
-            blog_rows.append(
-                Blog(
-                    id=item.get("id"),
-                    title=item.get("title", "").strip(),
-                    excerpt=item.get("excerpt", "").strip(),
-                    author=item.get("author", "").strip(),
-                    body=clean_optional_text(item.get("body")),
-                    image_url=clean_optional_text(item.get("image_url")),
-                    created_at=parse_iso_datetime(item.get("created_at")),
-                )
+            # Extract uploads (best-effort, after data for simplicity)
+            upload_members = [
+                name
+                for name in archive.namelist()
+                if name.startswith("uploads/") and not name.endswith("/")
+            ]
+            started = time.perf_counter()
+            for member in upload_members:
+                await run_in_threadpool(_extract_upload_member, archive, member)
+            timings_ms["uploads"] = round(
+                timings_ms.get("uploads", 0) + _elapsed_ms(started), 1
             )
 
-        if project_rows:
-            db.bulk_save_objects(project_rows)
-        if event_rows:
-            db.bulk_save_objects(event_rows)
-        if news_rows:
-            db.bulk_save_objects(news_rows)
-        if blog_rows:
-            db.bulk_save_objects(blog_rows)
-
-        # Extract uploads (best-effort, after data for simplicity)
-        upload_members = [
-            name
-            for name in archive.namelist()
-            if name.startswith("uploads/") and not name.endswith("/")
-        ]
-        for member in upload_members:
-            raw_subpath = member[len("uploads/") :]
-            if not raw_subpath:
-                continue
-            dest_path = (UPLOAD_DIR / raw_subpath).resolve()
-            try:
-                dest_path.relative_to(UPLOAD_DIR.resolve())
-            except ValueError:
-                # prevent path traversal
-                continue
-
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            with dest_path.open("wb") as f_out:
-                f_out.write(archive.read(member))
-
-        db.commit()
-        sync_sequences()
+        for table in CONTENT_TABLES:
+            await bump_content_version(db, table)
+
+        await db.commit()
+        started = time.perf_counter()
+        async with async_engine.begin() as conn:
+            await conn.run_sync(sync_sequences)
+        timings_ms["sync_sequences"] = _elapsed_ms(started)
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as exc:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"Restore failed: {exc}")
+    finally:
+        for archive in archives:
+            archive.close()
 
     return {
         "success": True,
-        "restored_counts": {
-            "projects": len(project_rows),
-            "events": len(event_rows),
-            "news": len(news_rows),
-            "blogs": len(blog_rows),
-        },
+        "archives": len(archives),
+        "restored_counts": restored_counts,
+        "timings_ms": timings_ms,
     }
 
 
+@app.get("/api/cache/stats")
+def cache_stats(_: bool = Depends(require_admin)):
+    return response_cache.stats()
+
+
+@app.get("/api/pool/stats")
+def pool_stats(_: bool = Depends(require_admin)):
+    return pool_metrics.snapshot(async_engine.sync_engine.pool)
+
+
 # Join Requests
 @app.post("/api/join", response_model=JoinRequestOut)
-def create_join_request(
+async def create_join_request(
     full_name: str = Form(...),
     email: Optional[str] = Form(None),
     whatsapp: Optional[str] = Form(None),
     phone: Optional[str] = Form(None),
     country: Optional[str] = Form(None),
     company: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     name_clean = full_name.strip()
     if not name_clean:
@@ -1418,22 +4365,40 @@ def create_join_request(
         company=company.strip() if company else None,
     )
     db.add(join_request)
-    db.commit()
-    db.refresh(join_request)
-    return JoinRequestOut.model_validate(join_request)
+    await db.commit()
+    await db.refresh(join_request)
+    return json_response(serialize_join_request(join_request))
 
 
-@app.get("/api/join", response_model=List[JoinRequestOut])
-def list_join_requests(db: Session = Depends(get_db)):
-    requests = db.query(JoinRequest).order_by(JoinRequest.created_at.desc()).all()
-    return requests
+@app.get(
+    "/api/join", response_model=Union[List[JoinRequestOut], Page[JoinRequestOut]]
+)
+async def list_join_requests(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return json_response(
+        await list_response(
+            db,
+            select(JoinRequest),
+            JoinRequest,
+            serialize_join_request,
+            limit,
+            cursor,
+        )
+    )
 
 
 # Market data proxy to avoid client-side CORS/rate limits
 @app.get("/api/market-data")
 async def market_data():
-    now = time.time()
-    cache_age = now - _coingecko_cache["ts"]
+    """
+    Cached CoinGecko rows. Past COINGECKO_CACHE_SECONDS the stale rows are
+    returned at once while one shared refresh runs in the background; only
+    a cold cache waits for upstream.
+    """
+    cache_age = time.time() - _coingecko_cache["ts"]
     if _coingecko_cache["rows"] and cache_age < COINGECKO_CACHE_SECONDS:
         return {
             "rows": _coingecko_cache["rows"],
@@ -1442,45 +4407,68 @@ async def market_data():
             "cache_age_seconds": cache_age,
         }
 
+    if _coingecko_cache["rows"]:
+        refresh_market_data()
+        response = {
+            "rows": _coingecko_cache["rows"],
+            "cached": True,
+            "stale": True,
+            "as_of": _coingecko_cache["as_of"],
+            "cache_age_seconds": cache_age,
+        }
+        if _coingecko_cache["error"]:
+            response["error"] = _coingecko_cache["error"]
+        return response
+
     try:
-        rows = await load_market_rows()
-    except Exception as exc:
-        if _coingecko_cache["rows"]:
-            return {
-                "rows": _coingecko_cache["rows"],
-                "cached": True,
-                "as_of": _coingecko_cache["as_of"],
-                "error": str(exc),
-            }
+        # Shielded: a disconnecting client must not cancel the shared fetch.
+        await asyncio.shield(refresh_market_data())
+    except Exception:
         raise HTTPException(status_code=502, detail="Failed to fetch market data")
-
-    as_of = datetime.utcnow().isoformat() + "Z"
-    _coingecko_cache.update({"rows": rows, "ts": now, "as_of": as_of})
-    return {"rows": rows, "cached": False, "as_of": as_of, "cache_age_seconds": 0}
+    return {
+        "rows": _coingecko_cache["rows"],
+        "cached": False,
+        "as_of": _coingecko_cache["as_of"],
+        "cache_age_seconds": 0,
+    }
 
 
 # --------------------
 # Legacy .php route aliases (for compatibility with existing frontend bundles)
 # --------------------
+def unpaginated(handler):
+    """Pin a paginated list handler to its original return-everything shape."""
+
+    takes_request = "request" in inspect.signature(handler).parameters
+
+    async def endpoint(request: Request, db: AsyncSession = Depends(get_db)):
+        kwargs = {"limit": None, "cursor": None, "db": db}
+        if takes_request:
+            kwargs["request"] = request
+        return await handler(**kwargs)
+
+    return endpoint
+
+
 legacy_routes = [
     ("POST", "/api/login.php", login),
     ("POST", "/api/logout.php", logout),
     ("GET", "/api/session.php", session),
     ("POST", "/api/upload.php", upload_file),
-    ("GET", "/api/projects.php", get_projects),
+    ("GET", "/api/projects.php", unpaginated(get_projects)),
     ("POST", "/api/projects.php", create_project),
     ("DELETE", "/api/projects.php", delete_project),
-    ("GET", "/api/events.php", get_events),
+    ("GET", "/api/events.php", unpaginated(get_events)),
     ("POST", "/api/events.php", create_event),
     ("DELETE", "/api/events.php", delete_event),
-    ("GET", "/api/news.php", get_news),
+    ("GET", "/api/news.php", unpaginated(get_news)),
     ("POST", "/api/news.php", create_news),
     ("DELETE", "/api/news.php", delete_news),
-    ("GET", "/api/blogs.php", get_blogs),
+    ("GET", "/api/blogs.php", unpaginated(get_blogs)),
     ("POST", "/api/blogs.php", create_blog),
     ("DELETE", "/api/blogs.php", delete_blog),
     ("POST", "/api/join.php", create_join_request),
-    ("GET", "/api/join.php", list_join_requests),
+    ("GET", "/api/join.php", unpaginated(list_join_requests)),
 ]
 
 for method, path, handler in legacy_routes:
@@ -1492,7 +4480,13 @@ for method, path, handler in legacy_routes:
     )
 
 
-if __name__ == "__main__":  # pragma: no cover
+if __name__ == "__main__" and sys.argv[1:] == ["migrate"]:  # pragma: no cover
+    applied = run_migrations()
+    print(
+        f"Applied migrations {applied}" if applied else "Schema is up to date",
+        f"(version {SCHEMA_VERSION})",
+    )
+elif __name__ == "__main__":  # pragma: no cover
     import uvicorn
 
     uvicorn.run(
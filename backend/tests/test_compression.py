@@ -0,0 +1,119 @@
+"""
+CompressionMiddleware and encoding negotiation on a bare app (no database:
+importing main only needs DATABASE_URL to be set).
+"""
+
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/gtn_test")
+
+from fastapi_app import main  # noqa: E402
+
+BIG = b'{"items": "' + b"x" * 4096 + b'"}'
+SVG = b"<svg xmlns='http://www.w3.org/2000/svg'>" + b"<rect/>" * 1000 + b"</svg>"
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "logo.svg").write_bytes(SVG)
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return Response(BIG, media_type="application/json", headers={"ETag": '"big-1"'})
+
+    @app.get("/small")
+    async def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/encoded")
+    async def encoded():
+        body = gzip.compress(BIG)
+        return Response(
+            body, media_type="application/json", headers={"Content-Encoding": "gzip"}
+        )
+
+    app.mount("/files", StaticFiles(directory=tmp_path))
+    app.add_middleware(main.CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip, br", "br" if "br" in main.CONTENT_ENCODERS else "gzip"),
+        ("br;q=0.5, gzip;q=0.9", "gzip"),
+        ("gzip;q=0, identity", None),
+        ("*;q=0.2, zstd;q=0", "br" if "br" in main.CONTENT_ENCODERS else "gzip"),
+        ("", None),
+    ],
+)
+def test_choose_encoding_follows_q_values(accept_encoding, expected):
+    assert main.choose_encoding(accept_encoding) == expected
+
+
+def test_large_body_is_compressed_with_an_encoded_etag(client):
+    response = client.get("/big", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"big-1-gzip"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BIG
+
+
+def test_small_body_is_left_alone(client):
+    response = client.get("/small", headers={"accept-encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == b'{"ok": true}'
+
+
+def test_already_encoded_body_passes_through(client):
+    response = client.get("/encoded", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BIG  # decoded once by the client, not twice
+
+
+def test_range_response_passes_through(client):
+    response = client.get(
+        "/files/logo.svg", headers={"accept-encoding": "gzip", "range": "bytes=0-9"}
+    )
+
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.content == SVG[:10]
+
+
+def test_encoded_etag_revalidates_to_304(client):
+    headers = {"accept-encoding": "gzip"}
+    first = client.get("/files/logo.svg", headers=headers)
+    etag = first.headers["etag"]
+    assert first.headers["content-encoding"] == "gzip"
+    assert etag.endswith('-gzip"')
+
+    again = client.get("/files/logo.svg", headers={**headers, "if-none-match": etag})
+
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert "Accept-Encoding" in again.headers["vary"]
+
+
+def test_identity_etag_still_revalidates_without_compression(client):
+    etag = client.get("/files/logo.svg", headers={"accept-encoding": "identity"}).headers[
+        "etag"
+    ]
+
+    again = client.get(
+        "/files/logo.svg", headers={"accept-encoding": "identity", "if-none-match": etag}
+    )
+
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
@@ -0,0 +1,82 @@
+"""
+CORSHeadersMiddleware on a bare app (no database: importing main only needs
+DATABASE_URL to be set).
+"""
+
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/gtn_test")
+
+from fastapi_app import main  # noqa: E402
+
+LISTED = "https://gtnnetwork.com"
+UNLISTED = "https://elsewhere.example"
+
+
+def make_client(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(main.CORSHeadersMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def request(client: TestClient, preflight: bool, origin=None):
+    headers = {"origin": origin} if origin else {}
+    if preflight:
+        headers["access-control-request-method"] = "POST"
+        return client.options("/ping", headers=headers)
+    return client.get("/ping", headers=headers)
+
+
+def assert_echoed(response, origin):
+    assert response.headers["access-control-allow-origin"] == origin
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert "Origin" in response.headers["vary"]
+    assert response.headers["access-control-allow-methods"] == main.CORS_ALLOW_METHODS
+
+
+@pytest.mark.parametrize("preflight", [True, False])
+def test_default_echoes_any_origin(preflight):
+    client = make_client()
+    for origin in (LISTED, UNLISTED):
+        response = request(client, preflight, origin)
+        assert response.status_code == 200
+        assert_echoed(response, origin)
+
+
+@pytest.mark.parametrize("preflight", [True, False])
+def test_allow_list_echoes_only_listed_origins(preflight):
+    client = make_client(allowed_origins=[LISTED])
+
+    assert_echoed(request(client, preflight, LISTED), LISTED)
+
+    refused = request(client, preflight, UNLISTED)
+    assert refused.status_code == 200
+    assert "access-control-allow-origin" not in refused.headers
+    assert "access-control-allow-credentials" not in refused.headers
+    assert "Origin" in refused.headers["vary"]
+
+
+@pytest.mark.parametrize("allowed_origins", [None, [LISTED]])
+@pytest.mark.parametrize("preflight", [True, False])
+def test_missing_origin_gets_wildcard(preflight, allowed_origins):
+    response = request(make_client(allowed_origins=allowed_origins), preflight)
+
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in response.headers
+    assert "vary" not in response.headers
+
+
+def test_preflight_is_answered_with_max_age():
+    response = request(make_client(max_age=600), True, LISTED)
+
+    assert response.headers["access-control-max-age"] == "600"
+    assert response.content == b""
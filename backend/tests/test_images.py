@@ -0,0 +1,56 @@
+"""
+Derivative generation in fastapi_app.images (no app import, no database).
+"""
+
+from PIL import Image
+
+from fastapi_app import images
+
+
+def make_upload(path, size=(800, 400)):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", size, (10, 20, 30)).save(path)
+    return path
+
+
+def derive(tmp_path, name):
+    source = make_upload(tmp_path / "uploads" / name)
+    return images.generate_derivatives(
+        str(source), name, str(tmp_path / "derived"), (320,), ("webp",), 75
+    )
+
+
+def test_same_stem_with_other_extension_gets_its_own_variants(tmp_path):
+    jpg = derive(tmp_path, "photo.jpg")
+    png = derive(tmp_path, "photo.png")
+
+    jpg_files = set(images.sidecar_files(jpg))
+    png_files = set(images.sidecar_files(png))
+    assert jpg_files and png_files
+    assert not jpg_files & png_files
+    for filename in jpg_files | png_files:
+        assert (tmp_path / "derived" / filename).is_file()
+
+
+def test_names_in_subdirectories_are_kept_apart(tmp_path):
+    first = derive(tmp_path, "a/photo.png")
+    second = derive(tmp_path, "b/photo.png")
+
+    assert set(images.sidecar_files(first)).isdisjoint(images.sidecar_files(second))
+    assert images.read_sidecar(tmp_path / "derived", "a/photo.png") == first
+    assert images.read_sidecar(tmp_path / "derived", "b/photo.png") == second
+
+
+def test_rotated_photo_width_follows_exif_orientation(tmp_path):
+    source = tmp_path / "rotated.jpg"
+    image = Image.new("RGB", (1000, 500))
+    exif = image.getexif()
+    exif[0x0112] = 6  # rotate 90 degrees on display
+    image.save(source, exif=exif)
+
+    record = images.generate_derivatives(
+        str(source), "rotated.jpg", str(tmp_path / "derived"), (320,), ("webp",), 75
+    )
+
+    assert record["width"] == 500
+    assert sorted(item["width"] for item in record["variants"]) == [320, 500]
@@ -0,0 +1,103 @@
+"""
+CoinGecko refresh behaviour against a mocked upstream (no network, no
+database: importing main only needs DATABASE_URL to be set).
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/gtn_test")
+
+from fastapi_app import main  # noqa: E402
+
+COINS = [f"coin{i}" for i in range(main.COINGECKO_VOLUME_SAMPLE_LIMIT)]
+
+
+def mock_upstream(throttled: set, calls: list):
+    """Markets for COINS; the first chart call for each `throttled` coin is a 429."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/coins/markets"):
+            return httpx.Response(200, json=[{"id": coin} for coin in COINS])
+        coin = request.url.path.split("/")[-2]
+        if coin in throttled:
+            throttled.discard(coin)
+            # Longer than COINGECKO_MAX_WAIT would allow, as real pauses are.
+            return httpx.Response(
+                429, headers={"retry-after": str(main.COINGECKO_MAX_WAIT + 0.5)}
+            )
+        return httpx.Response(200, json={"total_volumes": [[0, 100.0], [1, 150.0]]})
+
+    return handler
+
+
+def load_rows(monkeypatch, handler) -> list:
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(main, "get_http_client", lambda: client)
+            return await main.load_market_rows()
+
+    monkeypatch.setattr(main, "coingecko_bucket", main.TokenBucket(50, 5))
+    monkeypatch.setattr(main, "volume_change_cache", main.VolumeChangeCache(60, 100))
+    return asyncio.run(run())
+
+
+def test_429_pauses_and_later_coins_are_still_fetched(monkeypatch):
+    calls: list = []
+    rows = load_rows(monkeypatch, mock_upstream({COINS[1]}, calls))
+
+    assert [row["volumeChange24h"] for row in rows] == [50.0] * len(COINS)
+    chart_calls = [path for path in calls if path.endswith("/market_chart")]
+    # Every coin once, plus the retry of the throttled one.
+    assert len(chart_calls) == len(COINS) + 1
+
+
+def test_volume_changes_are_served_from_the_per_coin_cache(monkeypatch):
+    calls: list = []
+    handler = mock_upstream(set(), calls)
+    load_rows(monkeypatch, handler)
+    calls.clear()
+
+    async def run() -> list:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(main, "get_http_client", lambda: client)
+            return await main.load_market_rows()
+
+    rows = asyncio.run(run())
+    assert [row["volumeChange24h"] for row in rows] == [50.0] * len(COINS)
+    assert calls == ["/api/v3/coins/markets"]
+
+
+def test_pause_moves_waiting_callers_without_taking_extra_slots():
+    bucket = main.TokenBucket(rate=20, capacity=1)  # one call every 50 ms
+    order: list = []
+
+    async def call(tag: int) -> None:
+        await bucket.acquire()
+        order.append((tag, time.monotonic()))
+
+    async def run() -> tuple:
+        started = time.monotonic()
+        tasks = [asyncio.create_task(call(tag)) for tag in range(5)]
+        await asyncio.sleep(0.01)
+        due_before = bucket.next_due
+        # Covers the next waiter's slot (50 ms), not the later ones.
+        bucket.pause(0.08)
+        paused_until = bucket.paused_until
+        await asyncio.gather(*tasks)
+        return started, due_before, paused_until
+
+    started, due_before, paused_until = asyncio.run(run())
+
+    assert [tag for tag, _ in order] == [0, 1, 2, 3, 4]
+    # Every reserved slot moved back by the pause; none was taken twice.
+    assert bucket.next_due == pytest.approx(due_before + bucket.shifted)
+    assert bucket.shifted == pytest.approx(0.08)
+    for tag, finished in order[1:]:
+        assert finished >= paused_until
+        assert finished - started >= tag * bucket.interval + bucket.shifted - 0.01
@@ -0,0 +1,106 @@
+"""
+Keyset pagination helpers with a stand-in session (no database: importing
+main only needs DATABASE_URL to be set).
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/gtn_test")
+
+from fastapi_app import main  # noqa: E402
+
+NOW = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    """Returns canned rows and keeps the SQL it was asked to run."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.sql = []
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        self.sql.append(str(compiled))
+        return FakeResult(self.rows)
+
+
+def events(count):
+    return [
+        main.Event(id=100 - i, name=f"e{i}", created_at=NOW - timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def page(rows, limit, cursor=None):
+    db = FakeSession(rows)
+    result = asyncio.run(
+        main.keyset_page(db, select(main.Event), main.Event, limit, cursor)
+    )
+    return result, db.sql[0]
+
+
+@pytest.mark.parametrize("created_at", [NOW, None])
+def test_cursor_round_trips(created_at):
+    cursor = main.encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert main.decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["zz", "!!!", main.encode_cursor(NOW, 1)[:-3], "WyJub3QgYSBkYXRlIiwgMV0"]
+)
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        main.decode_cursor(cursor)
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == "Invalid cursor"
+
+
+def test_full_page_with_no_more_rows_has_no_cursor():
+    (rows, next_cursor), sql = page(events(3), limit=3)
+
+    assert [row.id for row in rows] == [100, 99, 98]
+    assert next_cursor is None
+    assert "LIMIT 4" in sql
+
+
+def test_extra_row_means_another_page_from_the_last_kept_row():
+    (rows, next_cursor), _ = page(events(4), limit=3)
+
+    assert [row.id for row in rows] == [100, 99, 98]
+    assert main.decode_cursor(next_cursor) == (rows[-1].created_at, 98)
+
+
+def test_cursor_continues_after_its_row():
+    _, sql = page([], limit=3, cursor=main.encode_cursor(NOW, 98))
+
+    assert "events.created_at < '2025-01-02 03:04:05.678901+00:00'" in sql
+    assert "events.id < 98" in sql
+    assert "ORDER BY events.created_at DESC NULLS FIRST, events.id DESC" in sql
+
+
+def test_cursor_on_a_null_created_at_moves_on_to_dated_rows():
+    _, sql = page([], limit=3, cursor=main.encode_cursor(None, 7))
+
+    assert "events.created_at IS NULL AND events.id < 7" in sql
+    assert "events.created_at IS NOT NULL" in sql
@@ -0,0 +1,62 @@
+"""
+Upload GC reference scanning and sweeping against a temporary LocalStorage
+(no database: importing main only needs DATABASE_URL to be set).
+"""
+
+import json
+import os
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/gtn_test")
+
+from fastapi_app import main  # noqa: E402
+
+PROSE = (
+    "See https://gtnnetwork.com/uploads/prose.png, and also /uploads/period.jpg. "
+    "The deck (/uploads/paren.webp) is attached; so is /uploads/semi.svg;"
+)
+MARKDOWN = (
+    '![cover](/uploads/md-cover.png "Cover") and [pdf](/uploads/md%20file.png)\n'
+    '<img src="/uploads/html.png?w=320" alt="x">'
+)
+JSON_TEXT = json.dumps(
+    {"images": ["/uploads/json-a.png", "https://cdn.example/uploads/sub/json-b.jpg"]}
+)
+
+
+def all_refs() -> set:
+    return set().union(*(main.upload_refs(text) for text in (PROSE, MARKDOWN, JSON_TEXT)))
+
+
+def test_upload_refs_stop_before_trailing_punctuation():
+    assert all_refs() == {
+        "prose.png",
+        "period.jpg",
+        "paren.webp",
+        "semi.svg",
+        "md-cover.png",
+        "md file.png",
+        "html.png",
+        "json-a.png",
+        "sub/json-b.jpg",
+    }
+
+
+def test_sweep_keeps_files_referenced_in_prose_markdown_and_json(tmp_path, monkeypatch):
+    storage = main.LocalStorage(tmp_path / "uploads", "uploads")
+    referenced = all_refs()
+    for name in referenced | {"orphan.png", "sub/orphan.jpg"}:
+        path = storage.path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+
+    discarded: list = []
+    monkeypatch.setattr(main, "upload_storage", storage)
+    monkeypatch.setattr(main.derivative_store, "discard", discarded.append)
+
+    removed, freed, kept = main._sweep_uploads(referenced, cutoff_ns=2**63, dry_run=False)
+
+    assert sorted(removed) == ["orphan.png", "sub/orphan.jpg"]
+    assert sorted(discarded) == sorted(removed)
+    assert freed == 2
+    assert {stored.name for stored in kept} == referenced
+    assert {stored.name for stored in storage.list()} == referenced
@@ -0,0 +1,140 @@
+"""
+Streaming upload ingestion (receive_upload, detect_image_type) on a bare app
+(no database: importing main only needs DATABASE_URL to be set).
+"""
+
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/gtn_test")
+
+from fastapi_app import main  # noqa: E402
+
+BOUNDARY = "gtn-test-boundary"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+LIMIT = 64 * 1024
+
+
+def multipart(data: bytes, field: str = "file", filename: str = "a.png") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def chunked(body: bytes, size: int = 4096):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+@pytest.fixture
+def tmp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_TMP_DIR", tmp_path)
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", LIMIT)
+    return tmp_path
+
+
+@pytest.fixture
+def client(tmp_dir):
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        tmp_path, filename, ext, digest = await main.receive_upload(request)
+        size = tmp_path.stat().st_size
+        tmp_path.unlink()
+        return {"filename": filename, "ext": ext, "sha256": digest, "size": size}
+
+    return TestClient(app)
+
+
+def post(client, body, **headers):
+    headers.setdefault("content-type", f"multipart/form-data; boundary={BOUNDARY}")
+    return client.post("/upload", content=body, headers=headers)
+
+
+@pytest.mark.parametrize(
+    "head, ext",
+    [
+        (b"\xff\xd8\xff\xe0", ".jpg"),
+        (PNG, ".png"),
+        (b"GIF89a", ".gif"),
+        (b"BM\x00\x00", ".bmp"),
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", ".webp"),
+        (b"\x00\x00\x00\x1cftypavif", ".avif"),
+        (b"\xef\xbb\xbf  <?xml version='1.0'?><svg xmlns='x'>", ".svg"),
+        (b"<!DOCTYPE svg><svg>", ".svg"),
+        (b"<?xml version='1.0'?><html>", None),
+        (b"%PDF-1.7", None),
+        (b"", None),
+    ],
+)
+def test_detect_image_type_sniffs_magic_bytes(head, ext):
+    assert main.detect_image_type(head) == ext
+
+
+def test_upload_is_streamed_to_a_temp_file(client, tmp_dir):
+    response = post(client, multipart(PNG, filename="logo.txt"))
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "filename": "logo.txt",
+        "ext": ".png",  # from the bytes, not the client's filename
+        "sha256": hashlib.sha256(PNG).hexdigest(),
+        "size": len(PNG),
+    }
+    assert list(tmp_dir.iterdir()) == []
+
+
+def test_chunked_upload_without_content_length(client):
+    data = PNG + b"\x01" * (LIMIT - len(PNG))
+    response = post(client, chunked(multipart(data)))
+
+    assert response.status_code == 200
+    assert response.json()["size"] == LIMIT
+
+
+def test_declared_content_length_over_the_limit_is_refused(client, tmp_dir):
+    body = multipart(PNG + b"\x00" * (LIMIT + main.UPLOAD_FORM_OVERHEAD))
+
+    response = post(client, body)
+
+    assert response.status_code == 413
+    assert list(tmp_dir.iterdir()) == []
+
+
+def test_chunked_body_over_the_limit_is_refused_and_cleaned_up(client, tmp_dir):
+    body = multipart(PNG + b"\x00" * (2 * LIMIT))
+
+    response = post(client, chunked(body))
+
+    assert response.status_code == 413
+    assert list(tmp_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "body, detail",
+    [
+        (multipart(b"%PDF-1.7 not an image"), "Only image files allowed"),
+        (multipart(PNG, field="other"), "No file received"),
+        (multipart(b""), "No file received"),
+    ],
+)
+def test_rejected_uploads_leave_no_temp_file(client, tmp_dir, body, detail):
+    response = post(client, body)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    assert list(tmp_dir.iterdir()) == []
+
+
+def test_non_multipart_body_is_refused(client, tmp_dir):
+    response = post(client, PNG, **{"content-type": "image/png"})
+
+    assert response.status_code == 400
+    assert list(tmp_dir.iterdir()) == []